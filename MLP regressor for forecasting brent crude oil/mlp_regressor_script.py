@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -5,34 +7,27 @@ from sklearn.preprocessing import MinMaxScaler
 from sklearn.neural_network import MLPRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error
-import yfinance as yf
 import joblib
 
-# 1. Retrieve historical Brent crude oil data
-brent = yf.download('BZ=F', start='2015-01-01', end='2025-01-01', interval='1d', auto_adjust=False)
-if 'Adj Close' in brent.columns:
-    brent = brent[['Adj Close']]
-    brent.rename(columns={'Adj Close': 'Brent_Price'}, inplace=True)
-brent.dropna(inplace=True)
-#print(brent)
+# Shared librairies (download engine) are in the folder "Shared librairies" at the root of the repository
+sys.path.append(os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared librairies")))
+import download_engine_librairies as download_engine
 
-# 2. Choose economic and financial variables
+# 1. Choose economic and financial variables
 selected_tickers = [
     '^GSPC', '^DJI', '^IXIC', 'GC=F', 'EURUSD=X', 'DX-Y.NYB', 'XAUUSD=X'
 ]
 
-# Download data for selected tickers
-dataframes = []
-for ticker in selected_tickers:
-    try:
-        df_var = yf.download(ticker, start='2015-01-01', end='2025-01-01', interval='1d', auto_adjust=False)
-        if 'Adj Close' in df_var.columns:
-            df_var = df_var[['Adj Close']]
-            df_var.rename(columns={'Adj Close': ticker}, inplace=True)
-            dataframes.append(df_var)
-    except Exception as e:
-        print(f"Failed to download data for {ticker}: {e}")
-    #print(df_var)
+# 2. Download Brent crude oil and the selected tickers in parallel
+prices = download_engine.download_all_data(['BZ=F'] + selected_tickers, '2015-01-01', '2025-01-01', verbose=False)
+
+# Historical Brent crude oil data
+brent = prices[['BZ=F']].rename(columns={'BZ=F': 'Brent_Price'})
+brent.dropna(inplace=True)
+#print(brent)
+
+# Keep the tickers that were downloaded
+dataframes = [prices[[ticker]] for ticker in selected_tickers if prices[ticker].notna().any()]
 
 # Merge data on date
 df = brent.copy()
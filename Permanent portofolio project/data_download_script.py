@@ -1,9 +1,66 @@
+import os
+import sys
+from datetime import date
+
+# Shared librairies (price store) are in the folder "Shared librairies" at the root of the repository
+SHARED_LIBRAIRIES = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Shared librairies"))
+if SHARED_LIBRAIRIES not in sys.path:
+    sys.path.append(SHARED_LIBRAIRIES)
+import price_store_librairies as price_store
 import data_download_librairies as data_lib
-import pickle
 
-CACHE_PATH = "data_download_global.pkl"  # the file used as cache
+# The folder used as cache (one file per ticker + date index), next to this script whatever the working directory
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_download_global_store")
+
+
+def get_data_download_global():
+    """
+    Data of the store, loaded on the first call only (importing this module does not read anything).
+    """
+    return price_store.get_dataset(STORE_PATH)
+
+
+def get_compact_data():
+    """
+    Compact version of the data (float32 columns, int32 day index, validity masks), built once per fingerprint.
+    """
+    return price_store.get_compact_dataset(STORE_PATH)
+
+
+def get_data_fingerprint():
+    """
+    Fingerprint of the loaded data (changes when the store is refreshed), used as key by the caches.
+    """
+    return price_store.get_dataset_fingerprint(STORE_PATH)
+
 
-if __name__ == "__main__":
+def set_data_download_global(data):
+    """
+    Use other data in memory instead of the store (ex: synthetic data for the benchmarks), nothing is written on disk.
+    """
+    price_store.set_dataset(STORE_PATH, data)
+
+
+def reset_data_download_global():
+    """
+    Forget the data in memory, the store is loaded again on the next call.
+    """
+    price_store.forget_dataset(STORE_PATH)
+
+
+def __getattr__(name):
+    # Keep "data_dl.data_download_global" working: the store is loaded on the first access
+    if name == "data_download_global":
+        return get_data_download_global()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if __name__ == "__main__" and "--refresh" in sys.argv:
+
+    # Refresh mode: only download the dates after the last stored date of each ticker and append them to the store
+    nb_new_dates = price_store.refresh_price_store(STORE_PATH, data_lib.download_all_data, date.today().isoformat(), start_date="1970-01-01")
+    print("Store refreshed:", STORE_PATH, "| new dates:", nb_new_dates)
+
+elif __name__ == "__main__":
 
     # Download the data and store it in memory (take more large than the simulations date at least 1 month before and 1 month after)
     data_download_global = data_lib.download_all_data("1970-01-01", "2025-01-09")
@@ -11,16 +68,10 @@ if __name__ == "__main__":
     # Check if the datas are empty
     if not data_download_global.empty:
         print(1)
-        # Save the variable into the cache
-        with open(CACHE_PATH, "wb") as f:   # wb = write binary
-            pickle.dump(data_download_global, f)
-        print("Cache created:", CACHE_PATH)
+        # Save the variable into the store
+        price_store.write_price_store(data_download_global, STORE_PATH)
+        print("Store created:", STORE_PATH)
 
     else:
         print('Error during the download')
         print(2)
-
-# Load the variable back from the cache
-with open(CACHE_PATH, "rb") as f:       # rb = read binary
-    data_download_global = pickle.load(f)
-#print("Cache loaded into memory and type is :", type(data_download_global))
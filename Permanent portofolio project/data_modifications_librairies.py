@@ -1,19 +1,52 @@
-import yfinance as yf
-import pandas as pd
 import numpy as np
+import pandas as pd
 import data_download_script as data_dl
+import permanent_portofolio_strategies_librairies as strategies_lib
+from instrumentation_librairies import instrument, measure
+
+# Name of the bond carry index in the daily panel (needs ^FVX and ^TYX)
+BOND_CARRY = "bonds"  # same name as the asset of the strategy table
+
+# Compact mode: the data is read as float32 columns with validity masks (data_dl.get_compact_data) instead of the
+# float64 DataFrame, the panels keep float32 values (opt-in, for large multi-asset histories and many workers)
+_COMPACT_MODE = False
+
+
+def set_compact_mode(enabled=True):
+    global _COMPACT_MODE
+    _COMPACT_MODE = bool(enabled)
+
+
+def _complete_data(data_download, tickers):
+    """
+    Dates where all the tickers have a value and their values (dates x tickers), from a DataFrame or from compact data.
+    """
+    if isinstance(data_download, pd.DataFrame):
+        complete = data_download[list(tickers)].dropna()
+        return complete.index, complete.to_numpy(dtype=np.float64)
+    rows, values = data_download.complete(list(tickers))
+    return data_download.dates(rows), values
+
 
+@instrument("data: get_economic_for_ratio_data", rows=lambda result, *args, **kwargs: len(result))
 def get_economic_for_ratio_data(start_date, end_date, tickers):
     """
     Retrieve the requested columns from data_dl.data_download_global for the specified period.
     """
 
+    # Compact mode: same rows, float32 values
+    if _COMPACT_MODE:
+        return data_dl.get_compact_data().complete_frame(tickers, start_date, end_date)
+
+    # Load the data on the first use only
+    data_download_global = data_dl.get_data_download_global()
+
     # Check that all_data is loaded
-    if data_dl.data_download_global is None:
+    if data_download_global is None:
         raise RuntimeError("❌ data is empty. Run data_download_script() first.")
 
     # Filter by period and columns
-    data_for_ratio = data_dl.data_download_global.loc[start_date:end_date, tickers]
+    data_for_ratio = data_download_global.loc[start_date:end_date, tickers]
 
     # # Percentage of missing values per column
     # missing_pct = (data_for_ratio.isna().mean() * 100).round(2)
@@ -24,29 +57,32 @@ def get_economic_for_ratio_data(start_date, end_date, tickers):
     return data_for_ratio.dropna()
 
 
+@instrument("data: get_economic_cadran_data", rows=lambda result, *args, **kwargs: len(result))
 def get_economic_cadran_data(economic_quadrant, start_date, end_date):
     """
     Extract from data_dl.data_download_global the series corresponding to the given economic quadrant over the specified period, and display the % of missing values per column.
     """
 
-    # Check that all_data is loaded
-    if data_dl.data_download_global is None:
-        raise RuntimeError("❌ data is empty. Run data_download_script() first.")
-
-    # Mapping cadrans → tickers
-    quadrants_tickers = {
-        "Quadrant 1: Inflationary Bust": ['GC=F', '^GSPC'],
-        "Quadrant 2: Inflationary Boom": ['GC=F', '^GSPC'],
-        "Quadrant 3: Deflationary Bust": ['^FVX', '^TYX', '^GSPC'],
-        "Quadrant 4: Deflationary Boom": ['^FVX', '^TYX', '^GSPC'],
-    }
+    # Mapping cadrans → tickers (from the strategy table)
+    quadrants_tickers = strategies_lib.QUADRANTS_TICKERS
     if economic_quadrant not in quadrants_tickers:
         raise ValueError(f"Error: Invalid quadrant ({economic_quadrant})")
 
     tickers = quadrants_tickers[economic_quadrant]
 
+    # Compact mode: same rows, float32 values
+    if _COMPACT_MODE:
+        return data_dl.get_compact_data().complete_frame(tickers, start_date, end_date)
+
+    # Load the data on the first use only
+    data_download_global = data_dl.get_data_download_global()
+
+    # Check that all_data is loaded
+    if data_download_global is None:
+        raise RuntimeError("❌ data is empty. Run data_download_script() first.")
+
     # Filter by period and columns
-    data_for_economic_cadrant = data_dl.data_download_global.loc[start_date:end_date, tickers]
+    data_for_economic_cadrant = data_download_global.loc[start_date:end_date, tickers]
 
     # # Percentage of missing values per column
     # missing_pct = (data_for_economic_cadrant.isna().mean() * 100).round(2)
@@ -56,3 +92,269 @@ def get_economic_cadran_data(economic_quadrant, start_date, end_date):
     # Remove NaN values to avoid errors
     return  data_for_economic_cadrant.dropna()
 
+
+class DailyPanel:
+    """
+    Daily calendar panel of a set of tickers, built once: only the dates where all the tickers have a value are kept,
+    then every calendar day is forward-filled (same as dropna() + reindex(freq="D") + ffill()). Row i is the day start + i.
+    """
+
+    # Days added after the last date so that the windows of the last year keep forward-filling
+    EXTRA_DAYS = 366
+
+    @instrument("data: build DailyPanel", rows=lambda result, self, *args, **kwargs: self.size)
+    def __init__(self, data_download, tickers):
+        self.tickers = list(tickers)
+        self.positions = {ticker: j for j, ticker in enumerate(self.tickers)}
+
+        # Rows where all the tickers have a value (float32 values in compact mode)
+        complete_dates, complete_values = _complete_data(data_download, self.tickers)
+        if len(complete_dates) == 0:
+            raise ValueError(f"No date with a value for all the tickers {self.tickers}")
+
+        # Calendar index (one row per day)
+        self.start = complete_dates[0].normalize()
+        end = complete_dates[-1].normalize() + pd.Timedelta(days=self.EXTRA_DAYS)
+        self.dates = pd.date_range(self.start, end, freq="D")
+        self.size = len(self.dates)
+
+        # Row of each complete date in the calendar
+        complete_rows = (complete_dates.normalize() - self.start).days.to_numpy()
+
+        # Forward-fill: each day takes the values of the last complete date (source_row remembers which one)
+        last_complete = np.searchsorted(complete_rows, np.arange(self.size), side="right") - 1
+        self.source_row = complete_rows[last_complete]
+        self.values = complete_values[last_complete]
+
+        # Log-price indexes and cumulative sum of the average bond yield, built on first use
+        self._log_prices = {}
+        self._carry_sums = None
+
+    def column(self, ticker):
+        """
+        Daily values of one ticker (array view, no copy).
+        """
+        if ticker not in self.positions:
+            raise KeyError(f"Ticker {ticker} is missing from the downloaded data.")
+        return self.values[:, self.positions[ticker]]
+
+    def rows(self, dates):
+        """
+        Row of each date (scalar or array of dates), no clipping.
+        """
+        if np.ndim(dates) == 0:
+            return (pd.Timestamp(dates) - self.start).days
+        return (pd.DatetimeIndex(dates) - self.start).days.to_numpy()
+
+    def window_rows(self, start_date, end_date, margin_days=0, valid_from=None):
+        """
+        First and last rows (included) with a value between start_date and end_date (scalars or arrays).
+        Like the old reindex on [start_date - margin_days, end_date] (or [valid_from, end_date] when valid_from is given),
+        a day only has a value when its last complete date is inside that range. The window is empty when first > last.
+        """
+        start_rows = np.asarray(self.rows(start_date))
+        end_rows = np.minimum(np.asarray(self.rows(end_date)), self.size - 1)
+        valid_rows = start_rows - margin_days if valid_from is None else self.rows(valid_from)
+
+        # First day whose forward-filled value comes from a date inside the window
+        first_valid = np.searchsorted(self.source_row, valid_rows, side="left")
+        first = np.maximum(start_rows, first_valid)
+
+        if first.ndim == 0:
+            return int(first), int(end_rows)
+        return first, end_rows
+
+    def log_price(self, ticker):
+        """
+        Cumulative log-price index of a ticker on the daily calendar (built on first use).
+        BOND_CARRY is the bond carry accrual index of the daily NAV: each day earns (1 + y) ** (1 / 365) with y the
+        average of ^FVX and ^TYX of the day (in decimal form). growth() does not use it for BOND_CARRY (see carry_growth).
+        """
+        if ticker not in self._log_prices:
+            if ticker == BOND_CARRY:
+                bond_avg = ((self.column('^FVX') + self.column('^TYX')) / 2) / 100
+                self._log_prices[ticker] = np.cumsum(np.log1p(bond_avg, dtype=np.float64) / 365)
+            else:
+                # Accumulated in float64 even in compact mode (one array per ticker)
+                self._log_prices[ticker] = np.log(self.column(ticker), dtype=np.float64)
+        return self._log_prices[ticker]
+
+    @instrument("data: DailyPanel.price_index", rows=lambda result, *args, **kwargs: len(result))
+    def price_index(self, ticker, start_date, end_date, valid_from=None):
+        """
+        Daily values of the price index of a ticker (or of BOND_CARRY) from start_date to end_date, forward-filled after the
+        last date. NaN for the days whose value comes from a date before valid_from (default start_date).
+        """
+        rows = np.arange(self.rows(start_date), self.rows(end_date) + 1)
+        valid_row = self.rows(start_date if valid_from is None else valid_from)
+
+        inside = np.clip(rows, 0, self.size - 1)
+        values = np.exp(self.log_price(ticker)[inside])
+
+        return np.where((rows >= 0) & (self.source_row[inside] >= valid_row), values, np.nan)
+
+    @instrument("data: DailyPanel.growth", rows=lambda result, *args, **kwargs: len(result))
+    def growth(self, ticker, start_dates, end_dates, margin_days=0, valid_from=None):
+        """
+        Growth of a ticker between the first and the last day with a value of each window (same as
+        (x.iloc[-1] - x.iloc[0]) / x.iloc[0] after dropna()), two reads of the log-price index per window.
+        NaN for the windows without value. BOND_CARRY uses carry_growth.
+        """
+        if ticker == BOND_CARRY:
+            return self.carry_growth(start_dates, end_dates, margin_days, valid_from)
+
+        first, last = self.window_rows(start_dates, end_dates, margin_days, valid_from)
+        first, last = np.atleast_1d(first), np.atleast_1d(last)
+        has_data = first <= last
+
+        log_price = self.log_price(ticker)
+        growth = np.expm1(log_price[np.where(has_data, last, 0)] - log_price[np.where(has_data, first, 0)])
+
+        return np.where(has_data, growth, np.nan)
+
+    def carry_growth(self, start_dates, end_dates, margin_days=0, valid_from=None):
+        """
+        Bond carry of each window: the average yield y of the days after the start of the window (mean of the average
+        of ^FVX and ^TYX, days without value excluded, like the old rolling mean over num_days) compounded daily over
+        num_days, ((1 + y) ** (1 / 365)) ** num_days - 1. Two reads of the cumulative sums per window.
+        NaN for the windows without value.
+        """
+        if self._carry_sums is None:
+            bond_avg = ((self.column('^FVX') + self.column('^TYX')) / 2) / 100
+            self._carry_sums = np.concatenate(([0.0], np.cumsum(bond_avg, dtype=np.float64)))
+
+        first, last = self.window_rows(start_dates, end_dates, margin_days, valid_from)
+        first, last = np.atleast_1d(first), np.atleast_1d(last)
+        start_rows = np.atleast_1d(self.rows(start_dates))
+        num_days = np.atleast_1d(self.rows(end_dates)) - start_rows
+
+        # The start day of the window is not in the average
+        first = np.maximum(first, start_rows + 1)
+        has_data = first <= last
+        first, last = np.where(has_data, first, 0), np.where(has_data, last, 0)
+        bonds_mean = (self._carry_sums[last + 1] - self._carry_sums[first]) / np.where(has_data, last - first + 1, 1)
+
+        # Compute daily compounded interest rate (in decimal form)
+        daily_interest_rate = (1 + bonds_mean) ** (1 / 365) - 1
+        return np.where(has_data, (1 + daily_interest_rate) ** num_days - 1, np.nan)
+
+    @instrument("data: DailyPanel.frame", rows=lambda result, *args, **kwargs: len(result))
+    def frame(self, start_date, end_date):
+        """
+        DataFrame of the panel between start_date and end_date (same as reindex + ffill on this range).
+        """
+        start_row, end_row = self.rows(start_date), self.rows(end_date)
+        rows = np.arange(start_row, end_row + 1)
+        inside = (rows >= 0) & (rows < self.size)
+
+        values = np.full((len(rows), len(self.tickers)), np.nan, dtype=self.values.dtype)
+        values[inside] = self.values[rows[inside]]
+
+        # The values coming from a date before start_date are not in the range
+        valid = np.zeros(len(rows), dtype=bool)
+        valid[inside] = self.source_row[rows[inside]] >= start_row
+        values[~valid] = np.nan
+
+        index = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date), freq="D")
+        return pd.DataFrame(values, index=index, columns=self.tickers)
+
+
+class VolatilityIndex:
+    """
+    Prefix sums of the daily returns and squared returns of a set of tickers, built once.
+    Rows are the dates where all the tickers have a value (same as get_economic_cadran_data), so the realised
+    volatility of any window is the same as pct_change().std() * sqrt(number of dates), in constant time.
+    """
+
+    @instrument("data: build VolatilityIndex", rows=lambda result, self, *args, **kwargs: len(self.dates))
+    def __init__(self, data_download, tickers):
+        self.tickers = list(tickers)
+        self.positions = {ticker: j for j, ticker in enumerate(self.tickers)}
+
+        # Rows where all the tickers have a value (float32 prices in compact mode)
+        complete_dates, prices = _complete_data(data_download, self.tickers)
+        self.dates = pd.DatetimeIndex(complete_dates).values.astype("datetime64[ns]")
+
+        # Daily returns (row j = return between the dates j-1 and j, the first row has no return), in float64
+        returns = np.zeros(prices.shape)
+        returns[1:] = np.divide(prices[1:], prices[:-1], dtype=np.float64) - 1
+
+        # Returns centred on their mean: the variance does not change and the prefix sums lose less precision
+        self.shift = returns[1:].mean(axis=0) if len(returns) > 1 else np.zeros(len(self.tickers))
+        centred = returns - self.shift
+        centred[0] = 0.0
+        self.cum_returns = np.vstack((np.zeros(len(self.tickers)), np.cumsum(centred, axis=0)))
+        self.cum_squares = np.vstack((np.zeros(len(self.tickers)), np.cumsum(centred ** 2, axis=0)))
+
+    @instrument("data: VolatilityIndex.volatility_batch", rows=lambda result, *args, **kwargs: len(result))
+    def volatility_batch(self, ticker, start_dates, end_dates):
+        """
+        Realised volatility of a ticker on many windows [start_date, end_date] (both included), NaN with less than 2 returns.
+        """
+        if ticker not in self.positions:
+            raise KeyError(f"Ticker {ticker} is missing from the downloaded data.")
+        j = self.positions[ticker]
+
+        # First and last rows of each window
+        start_dates = pd.DatetimeIndex(pd.to_datetime(start_dates)).values.astype("datetime64[ns]")
+        end_dates = pd.DatetimeIndex(pd.to_datetime(end_dates)).values.astype("datetime64[ns]")
+        first = np.searchsorted(self.dates, start_dates, side="left")
+        last = np.searchsorted(self.dates, end_dates, side="right") - 1
+
+        # The returns of the window are the rows first + 1 .. last
+        nb_dates = np.maximum(last - first + 1, 0)
+        nb_returns = np.maximum(last - first, 0)
+        top = len(self.cum_returns) - 1
+        low, high = np.clip(first + 1, 0, top), np.clip(last + 1, 0, top)
+        sum_returns = np.where(nb_returns > 0, self.cum_returns[high, j] - self.cum_returns[low, j], 0.0)
+        sum_squares = np.where(nb_returns > 0, self.cum_squares[high, j] - self.cum_squares[low, j], 0.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (sum_squares - sum_returns ** 2 / nb_returns) / (nb_returns - 1)
+        variance = np.where(nb_returns >= 2, np.maximum(variance, 0.0), np.nan)
+
+        return np.sqrt(variance) * np.sqrt(nb_dates)
+
+    def volatility(self, ticker, start_date, end_date):
+        """
+        Realised volatility of a ticker on one window.
+        """
+        return float(self.volatility_batch(ticker, [start_date], [end_date])[0])
+
+
+# Indexes already built (key = kind of index + tickers + compact mode), rebuilt when the dataset changes
+_INDEXES = {}
+
+
+def _get_index(index_class, tickers):
+    """
+    Build an index (DailyPanel, VolatilityIndex) once per dataset and tickers.
+    """
+
+    # Loading the store (memory-mapped files) only takes time on the first call
+    with measure("data: load dataset"):
+        data_download_global = data_dl.get_compact_data() if _COMPACT_MODE else data_dl.get_data_download_global()
+
+    key = (index_class.__name__, tuple(tickers), _COMPACT_MODE)
+    cached = _INDEXES.get(key)
+    if cached is not None and cached[0] is data_download_global:
+        return cached[1]
+
+    index = index_class(data_download_global, tickers)
+    _INDEXES[key] = (data_download_global, index)
+
+    return index
+
+
+def get_daily_panel(tickers):
+    """
+    Return the daily panel of the tickers, built once per dataset.
+    """
+    return _get_index(DailyPanel, tickers)
+
+
+def get_volatility_index(tickers):
+    """
+    Return the volatility index of the tickers, built once per dataset.
+    """
+    return _get_index(VolatilityIndex, tickers)
@@ -0,0 +1,146 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import pandas as pd
+
+# Opt-in: PERMANENT_PORTFOLIO_PROFILE=1 in the environment (or enable() in the code).
+# When disabled, an instrumented function only costs one test of _ENABLED.
+_ENABLED = os.environ.get("PERMANENT_PORTFOLIO_PROFILE", "") not in ("", "0")
+
+# Statistics of each stage: [calls, cumulative time (s), rows touched] (per process: each sweep worker has its own)
+_STATS = {}
+_LOCK = threading.Lock()
+
+
+def enable():
+    global _ENABLED
+    _ENABLED = True
+
+
+def disable():
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def reset():
+    with _LOCK:
+        _STATS.clear()
+
+
+def _record(stage, elapsed, rows):
+    with _LOCK:
+        stats = _STATS.setdefault(stage, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += rows
+
+
+def instrument(stage, rows=None):
+    """
+    Decorator counting the calls, the cumulative time and the rows touched by a function (stage = name in the report).
+    rows(result, *args, **kwargs) gives the number of rows touched by one call (ex: lambda result, *a, **k: len(result)).
+    The time of a stage includes the time of the stages it calls.
+    """
+
+    def decorator(function):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return function(*args, **kwargs)
+
+            start_time = time.perf_counter()
+            nb_rows = 0
+            try:
+                result = function(*args, **kwargs)
+                if rows is not None:
+                    nb_rows = int(rows(result, *args, **kwargs))
+                return result
+            finally:
+                _record(stage, time.perf_counter() - start_time, nb_rows)
+
+        return wrapper
+
+    return decorator
+
+
+class _Stage:
+    # Context manager of measure() when the instrumentation is enabled
+    def __init__(self, stage, rows):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.stage, time.perf_counter() - self.start_time, self.rows)
+
+
+class _NullStage:
+    # Context manager of measure() when the instrumentation is disabled (nothing measured)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def measure(stage, rows=0):
+    """
+    Context manager measuring a block of code as a stage (ex: with measure("load dataset"): ...).
+    """
+    return _Stage(stage, rows) if _ENABLED else _NULL_STAGE
+
+
+def get_report():
+    """
+    Statistics of each stage (calls, cumulative time, mean time, rows touched), the slowest stages first.
+    """
+
+    with _LOCK:
+        rows = [{"stage": stage, "calls": calls, "total_s": total, "mean_s": total / calls if calls else 0.0, "rows": nb_rows}
+                for stage, (calls, total, nb_rows) in _STATS.items()]
+
+    report = pd.DataFrame(rows, columns=["stage", "calls", "total_s", "mean_s", "rows"])
+    return report.sort_values("total_s", ascending=False, ignore_index=True)
+
+
+def report_json(path=None):
+    """
+    Report as JSON (written in path when given).
+    """
+
+    text = json.dumps(get_report().to_dict(orient="records"), indent=2)
+    if path is not None:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+def print_report():
+    report = get_report()
+    if not report.empty:
+        print("\n⏱️ Profiling report (time of a stage includes the stages it calls):")
+        print(report.to_string(index=False))
+
+
+# With PERMANENT_PORTFOLIO_PROFILE the report is printed at the end of the run
+# (PERMANENT_PORTFOLIO_PROFILE=path.json: written as JSON in this file instead)
+if _ENABLED:
+    _PROFILE_TARGET = os.environ.get("PERMANENT_PORTFOLIO_PROFILE")
+    if _PROFILE_TARGET.endswith(".json"):
+        atexit.register(report_json, _PROFILE_TARGET)
+    else:
+        atexit.register(print_report)
@@ -0,0 +1,211 @@
+import contextlib
+import io
+import itertools
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import data_download_script as data_dl
+import price_store_librairies as price_store
+import permanent_portofolio_simulations_librairies as lib
+import permanent_portofolio_graphics_librairies_and_script as graphics
+import quadrant_cache_librairies as quadrant_cache
+
+
+def generate_synthetic_panel(nb_years, nb_tickers=4, seed=0, start_date="1990-01-01"):
+    """
+    Synthetic prices (business days, no network) with the same columns as data_download_global:
+    GC=F and ^GSPC follow geometric brownian motions, ^FVX and ^TYX are yields in % (mean-reverting, always positive),
+    the extra tickers (SYN1, SYN2, ...) start at random dates like futures (NaN before their first date).
+    """
+
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start_date, periods=int(nb_years * 261), name="Date")
+    nb_dates = len(dates)
+
+    def brownian(price, drift, vol):
+        return price * np.exp(np.cumsum(rng.normal(drift / 261 - vol ** 2 / 522, vol / np.sqrt(261), nb_dates)))
+
+    def yields(level):
+        values = np.empty(nb_dates)
+        values[0] = level
+        shocks = rng.normal(0, 0.05, nb_dates)
+        for i in range(1, nb_dates):
+            values[i] = values[i - 1] + 0.01 * (level - values[i - 1]) + shocks[i]
+        return np.maximum(values, 0.05)
+
+    columns = {
+        'GC=F': brownian(400.0, 0.05, 0.16),
+        '^GSPC': brownian(1000.0, 0.07, 0.18),
+        '^FVX': yields(4.0),
+        '^TYX': yields(4.5),
+    }
+    for i in range(1, max(nb_tickers - 4, 0) + 1):
+        values = brownian(100.0, 0.03, 0.3)
+        values[:rng.integers(0, nb_dates // 2)] = np.nan
+        columns[f"SYN{i}"] = values
+
+    data = pd.DataFrame(columns, index=dates)
+    data.columns.name = "Ticker"
+    return data
+
+
+def _measure(function, repeat, setup=None):
+    """
+    Wall time of each call (after one warm-up call) and peak memory of one call.
+    setup() runs before each call and is not measured (ex: set the dataset again for a cold start).
+    """
+
+    # Warm-up: imports and first-call costs, and the indexes of the dataset when there is no setup
+    # (measured apart, in the "build_indexes" benchmark)
+    if setup is not None:
+        setup()
+    function()
+
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return times, peak
+
+
+def _build_indexes():
+    # Build the daily panel and the volatility index of the dataset
+    lib.get_market_ratios_batch(["2000-01-01"], ["2001-01-01"])
+    lib.volatility("2000-01-01", "2001-01-01")
+
+
+def _row(name, nb_years, nb_tickers, rebalance_days, times, peak, nb_calls=1):
+    # One result row (the rebalancing days are None for the cases that do not depend on them)
+    case = f"{name}|{nb_years}y|{nb_tickers}t" + (f"|{rebalance_days}d" if rebalance_days is not None else "")
+    return {
+        "case": case,
+        "function": name,
+        "history_years": nb_years,
+        "nb_tickers": nb_tickers,
+        "rebalance_days": rebalance_days,
+        "wall_s": min(times),
+        "mean_s": float(np.mean(times)),
+        "calls_per_s": nb_calls / min(times),
+        "peak_mb": peak / 1024 ** 2,
+    }
+
+
+def _benchmarks(nb_years, rebalance_days, nb_windows):
+    """
+    Functions measured on a dataset of nb_years years: (name, function, calls per run).
+    """
+
+    last_year = 1990 + nb_years
+    years = list(range(max(1991 + 5, last_year - 10), last_year))
+    starts = [f"{y - 5}-01-01" for y in range(1996, 1996 + nb_windows)]
+    ends = [f"{y}-01-01" for y in range(1996, 1996 + nb_windows)]
+    year_start, year_end = f"{years[0]}-01-01", f"{years[0] + 1}-01-01"
+
+    def simulation():
+        quadrant_cache.get_quadrant_cache().clear()
+        graphics.simulation(years, 5, rebalance_days, 1000, headless=True)
+
+    return [
+        ("get_market_ratios", lambda: [lib.get_market_ratios(s, e) for s, e in zip(starts, ends)], len(starts)),
+        ("get_market_ratios_batch", lambda: lib.get_market_ratios_batch(starts, ends), len(starts)),
+        ("get_return_of_investments", lambda: lib.get_return_of_investments(
+            1000, rebalance_days, "Quadrant 4: Deflationary Boom", year_start, year_end), 1),
+        ("volatility", lambda: lib.volatility(year_start, year_end), 1),
+        ("simulation", simulation, 1),
+    ]
+
+
+def run_benchmarks(history_years_grid=(15, 30, 50), tickers_grid=(4, 50), rebalance_days_grid=(1, 30),
+                   repeat=5, nb_windows=10, seed=0):
+    """
+    Run the benchmarks on synthetic datasets of every size (the real data is restored at the end).
+    The extra tickers are only read by load_store, the simulations use GC=F, ^GSPC, ^FVX and ^TYX.
+    Return a list of rows: case, function, sizes, wall time (best and mean of the repeats), calls per second, peak memory.
+    """
+
+    rows = []
+    try:
+        for nb_years, nb_tickers in itertools.product(history_years_grid, tickers_grid):
+            data = generate_synthetic_panel(nb_years, nb_tickers, seed)
+
+            # Time to read a store of all the tickers (first load of the dataset, grows with the number of tickers)
+            with tempfile.TemporaryDirectory() as store_path:
+                price_store.write_price_store(data, store_path)
+                times, peak = _measure(lambda: price_store.read_price_store(store_path), repeat)
+            rows.append(_row("load_store", nb_years, nb_tickers, None, times, peak))
+
+            # Time to build the daily panel and the volatility index of a new dataset (cold start): a new copy of the
+            # dataset is set before each build (new object and fingerprint, so nothing built before is reused)
+            with contextlib.redirect_stdout(io.StringIO()):
+                times, peak = _measure(_build_indexes, repeat,
+                                       setup=lambda: data_dl.set_data_download_global(data.copy(deep=False)))
+            rows.append(_row("build_indexes", nb_years, nb_tickers, None, times, peak))
+
+            for rebalance_days in rebalance_days_grid:
+                for name, function, nb_calls in _benchmarks(nb_years, rebalance_days, nb_windows):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        times, peak = _measure(function, repeat)
+                    rows.append(_row(name, nb_years, nb_tickers, rebalance_days, times, peak, nb_calls))
+    finally:
+        data_dl.reset_data_download_global()
+
+    return rows
+
+
+def write_benchmarks(rows, path):
+    """
+    Write the results with the environment in a JSON file.
+    """
+
+    report = {
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": rows,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def read_benchmarks(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare_to_baseline(rows, baseline_rows, tolerance=0.25):
+    """
+    Compare the best wall time of each case with the baseline: a case is a regression when it is more than
+    tolerance (25% by default) slower. The cases missing from the baseline are not flagged.
+    """
+
+    baseline = {row["case"]: row for row in baseline_rows}
+    comparison = []
+    for row in rows:
+        reference = baseline.get(row["case"])
+        ratio = row["wall_s"] / reference["wall_s"] if reference is not None and reference["wall_s"] > 0 else np.nan
+        comparison.append({
+            "case": row["case"],
+            "wall_s": row["wall_s"],
+            "baseline_wall_s": reference["wall_s"] if reference is not None else np.nan,
+            "ratio": ratio,
+            "regression": bool(ratio > 1 + tolerance),
+        })
+
+    return pd.DataFrame(comparison)
@@ -0,0 +1,27 @@
+import os
+import sys
+import permanent_portofolio_benchmark_librairies as benchmark
+
+# Files next to this script: last results and the baseline used to detect regressions
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results.json")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+if __name__ == "__main__":
+
+    # Synthetic datasets (no network): 15, 30 and 50 years, 4 and 50 tickers, daily and monthly rebalancing
+    rows = benchmark.run_benchmarks(history_years_grid=(15, 30, 50), tickers_grid=(4, 50), rebalance_days_grid=(1, 30))
+    benchmark.write_benchmarks(rows, RESULTS_PATH)
+    print("Results saved:", RESULTS_PATH)
+
+    # "--save-baseline": the results become the new baseline
+    if "--save-baseline" in sys.argv or not os.path.exists(BASELINE_PATH):
+        benchmark.write_benchmarks(rows, BASELINE_PATH)
+        print("Baseline saved:", BASELINE_PATH)
+        sys.exit(0)
+
+    # Compare with the baseline (exit code 1 when a case is slower)
+    comparison = benchmark.compare_to_baseline(rows, benchmark.read_benchmarks(BASELINE_PATH))
+    print(comparison.to_string(index=False))
+    if comparison["regression"].any():
+        print("Regressions:", ", ".join(comparison.loc[comparison["regression"], "case"]))
+        sys.exit(1)
@@ -1,93 +1,23 @@
+import os
 import permanent_portofolio_simulations_librairies as lib
-import matplotlib.pyplot as plt
-import pandas as pd
-import random
 from typing import Iterable, List, Union
 
-# Compute and show the results
-def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,money) :
-
-    years=[]
-    gb_ratios = []
-    ge_ratios = []
-    quadrants = []
-    money_finals = []
-    perfs = []
-    all_years_vol_gold = []
-    all_years_vol_equity = []
-
-    # Init monay
-    final_money = money
-
-    for a in annees:
-        y = int(a)
-        # Fenêtre pour les ratios
-        ratio_start = f"{y - lookback_years}-01-01"
-        ratio_end   = f"{y}-01-01"
-        # Fenêtre pour la perf de l'année
-        year_start  = f"{y}-01-01"
-        year_end    = f"{y+1}-01-01"
-
-        # Quadrant 5 init management (change with strategy)
-        # last_year_quadrant = None
-        quadrant_5 = 0
-
-        # 1) Ratios & cadran basé sur la fenêtre lookback
-        gold_bonds_ratio, gold_equity_ratio = lib.get_market_ratios(ratio_start, ratio_end)
-        #0gold_bonds_ratio, gold_equity_ratio = 10 *, 10 # Pour eviter les pourcentage
-        quadrant = lib.determine_quadrant(gold_bonds_ratio, gold_equity_ratio)
-        # Test on laisse que sur le cadrant 2
-        quadrant = "Quadrant 2: Inflationary Boom"
-        # DCA
-        #final_money = final_money + 2*20_000
-
-        # Use the last year quadrant for this case but can change with the strategy
-        if quadrant == "Quadrant 5: Transition Quadrant":
-
-            # if last_year_quadrant is not None:
-            #     #quadrant = last_year_quadrant
-
-            quadrant_5= 1
-
-            # else:
-            #             # Random quadrant if last year quadrant is none
-            #             quadrant = random.choice([
-            #                 "Quadrant 1: Inflationary Bust",
-            #                 "Quadrant 2: Inflationary Boom",
-            #                 "Quadrant 3: Deflationary Bust",
-            #                 "Quadrant 4: Deflationary Boom"
-            #             ])
-
-        # Put the quadrant in the memory for the next year (change with the strategy)
-        #last_year_quadrant = quadrant
-
-        # Compute money and perfroamnce
-        if quadrant_5 == 1:
-            final_money, performance_pct = final_money, 1
-            quadrants.append("Quadrant 5: Transition Quadrant")
-
-        else:
-            final_money, performance_pct, _  = lib.get_return_of_investments(final_money, rebalance_days, quadrant, year_start, year_end)
-            # Change tickers in str for the list
-            quadrants.append(str(quadrant))
-
-        # Compute volatility and add to the list of volatilities
-        vol_gold, vol_equity = lib.volatility(year_start, year_end)
-
-        # Add elements to the lists
-        years.append(y)
-        gb_ratios.append(gold_bonds_ratio)
-        ge_ratios.append(gold_equity_ratio)
-        money_finals.append(final_money)
-        perfs.append(performance_pct)
-        all_years_vol_gold.append(vol_gold)
-        all_years_vol_equity.append(vol_equity)
-
-
-    # Check if all the have the same size
-    n = len(years)
-    if not all(len(lst) == n for lst in [gb_ratios, ge_ratios, quadrants, money_finals, perfs, quadrants, all_years_vol_gold, all_years_vol_equity]):
-        raise ValueError("Les listes n'ont pas toutes la même longueur. Vérifie tes 'append'.")
+# Compute and show the results (headless=True: only return the results, matplotlib is not imported)
+def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,money,headless=False,output_dir=None) :
+
+    # Run the strategy (headless: the margin calls are not printed)
+    results = lib.run_simulation(annees, lookback_years, rebalance_days, money, verbose=not headless)
+
+    years = results["years"]
+    gb_ratios = results["gb_ratios"]
+    ge_ratios = results["ge_ratios"]
+    quadrants = results["quadrants"]
+    money_finals = results["money_finals"]
+    perfs = results["perfs"]
+
+    # Batch mode: same results as below, nothing is printed or plotted
+    if headless:
+        return years, gb_ratios, ge_ratios, quadrants, money_finals, perfs
 
     # Show the list quadrants
     for i in range(len(years)):
@@ -99,6 +29,38 @@ def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,m
     for i in range(len(years)):
         print(f"Année {years[i]} : performance (%) :{perfs[i]} money : {money_finals[i]}")
 
+    # Plots (in windows, or in PNG files when output_dir is given)
+    plot_simulation(results, output_dir)
+
+    return years, gb_ratios, ge_ratios, quadrants, money_finals, perfs
+
+
+# Save the current figure in output_dir (nothing to do when the figures are shown in windows)
+def _save_figure(plt, output_dir, name):
+
+    if output_dir is not None:
+        plt.savefig(os.path.join(output_dir, f"{name}.png"))
+        plt.close()
+
+
+# Plot the results of lib.run_simulation (output_dir=None: show the figures, else write them as PNG files)
+def plot_simulation(results, output_dir=None):
+
+    # matplotlib is only imported when something is plotted
+    if output_dir is not None:
+        import matplotlib
+        matplotlib.use("Agg")
+        os.makedirs(output_dir, exist_ok=True)
+    import matplotlib.pyplot as plt
+
+    years = results["years"]
+    gb_ratios = results["gb_ratios"]
+    ge_ratios = results["ge_ratios"]
+    money_finals = results["money_finals"]
+    perfs = results["perfs"]
+    vols_gold = results["vols_gold"]
+    vols_equity = results["vols_equity"]
+
     # plot ratios Gold/(Bonds or cash)
     plt.figure(figsize=(10, 4))
     plt.plot(years, gb_ratios, marker="o", label="Ratio Gold/(Bonds or cash)")
@@ -108,6 +70,7 @@ def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,m
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "ratio_gold_bonds")
 
     # plot ratios Gold/Equity
     plt.figure(figsize=(10, 4))
@@ -118,6 +81,7 @@ def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,m
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "ratio_gold_equity")
 
     # plot performance
     plt.figure(figsize=(10, 4))
@@ -128,6 +92,7 @@ def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,m
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "performance")
 
     # plot final money (€)
     plt.figure(figsize=(10, 4))
@@ -138,34 +103,39 @@ def simulation(annees: Iterable[Union[int, str]],lookback_years,rebalance_days,m
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "final_money")
 
     # plot asset volatility (gold)
     plt.figure(figsize=(10, 4))
-    plt.plot(years, all_years_vol_gold, marker="s", linestyle=":", label="Volatilite or")
+    plt.plot(years, vols_gold, marker="s", linestyle=":", label="Volatilite or")
     plt.title("Indicateurs – Portefeuille permanent : Volatilité or")
     plt.xlabel("Année")
     plt.ylabel("Vol or")
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "volatility_gold")
 
     # plot asset volatility (equity)
     plt.figure(figsize=(10, 4))
-    plt.plot(years, all_years_vol_equity, marker="s", linestyle=":", label="Volatilite actions")
+    plt.plot(years, vols_equity, marker="s", linestyle=":", label="Volatilite actions")
     plt.title("Indicateurs – Portefeuille permanent : Volatilité actions")
     plt.xlabel("Année")
     plt.ylabel("Vol actions")
     plt.grid(True, linestyle="--", linewidth=0.5, alpha=0.6)
     plt.legend()
     plt.tight_layout()
+    _save_figure(plt, output_dir, "volatility_equity")
 
-    plt.show()
+    if output_dir is None:
+        plt.show()
 
-    return years, gb_ratios, ge_ratios, quadrants, money_finals, perfs
 
-# Example
-liste_annee = list(range(2021, 2026))   # 1995 to 2025 include
-#print(liste_annee)
-money = 15*2*700
-resultats = simulation(liste_annee, 7, 30, money)
-print(money)
\ No newline at end of file
+if __name__ == "__main__":
+
+    # Example
+    liste_annee = list(range(2021, 2026))   # 1995 to 2025 include
+    #print(liste_annee)
+    money = 15*2*700
+    resultats = simulation(liste_annee, 7, 30, money)
+    print(money)
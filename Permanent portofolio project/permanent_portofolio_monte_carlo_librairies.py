@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import data_modifications_librairies as data_modif
+import permanent_portofolio_strategies_librairies as strategies_lib
+
+
+def get_historical_log_returns(economic_quadrant, assets, start_date=None, end_date=None, max_gap_days=7):
+    """
+    Daily log returns (dates x assets) of the assets of a quadrant between two dates where all its tickers have a value.
+    The bonds return is the carry accrued between the two dates (ratio of the carry index).
+    Returns spanning more than max_gap_days calendar days (holes in the history, ex: ^TYX in 2002-2006) are dropped.
+    """
+
+    panel = data_modif.get_daily_panel(strategies_lib.QUADRANTS_TICKERS[economic_quadrant])
+
+    # Rows of the dates with a value for all the tickers (the forward-filled days are skipped)
+    rows = np.unique(panel.source_row)
+    if start_date is not None:
+        rows = rows[rows >= panel.rows(start_date)]
+    if end_date is not None:
+        rows = rows[rows <= panel.rows(end_date)]
+    if len(rows) < 2:
+        raise ValueError("Not enough history to compute daily returns.")
+
+    log_returns = np.column_stack([np.diff(panel.log_price(asset)[rows]) for asset in assets])
+    return log_returns[np.diff(rows) <= max_gap_days]
+
+
+def block_bootstrap_indexes(rng, nb_history, nb_paths, horizon_days, block_days):
+    """
+    Indexes (paths x days) of the resampled returns: blocks of block_days consecutive days with random starts.
+    """
+
+    block_days = min(block_days, nb_history)
+    nb_blocks = -(-horizon_days // block_days)
+    starts = rng.integers(0, nb_history - block_days + 1, size=(nb_paths, nb_blocks))
+    indexes = starts[:, :, None] + np.arange(block_days)
+    return indexes.reshape(nb_paths, nb_blocks * block_days)[:, :horizon_days]
+
+
+def simulate_paths(log_returns, weights, money, rebalance_days):
+    """
+    NAV of the strategies on synthetic paths (log_returns: paths x days x assets, weights: strategies x assets).
+    The holdings drift with the prices and go back to the weights every rebalance_days days.
+    Return (terminal wealth: paths x strategies, maximum drawdown: paths x strategies).
+    """
+
+    nb_paths, nb_days, _ = log_returns.shape
+
+    # Sub-period of each day and growth of each asset since the start of its sub-period
+    period = np.arange(nb_days) // rebalance_days
+    period_starts = np.arange(0, nb_days, rebalance_days)
+    cum_log = np.cumsum(log_returns, axis=1)
+    base = np.concatenate((np.zeros((nb_paths, 1, log_returns.shape[2])), cum_log[:, period_starts[1:] - 1]), axis=1)
+    relative = np.exp(cum_log - base[:, period])
+
+    # Growth of the portfolio since the start of the sub-period, then value at the start of each sub-period
+    portfolio_relative = relative @ weights.T
+    period_ends = np.minimum(period_starts + rebalance_days, nb_days) - 1
+    period_money = np.cumprod(portfolio_relative[:, period_ends], axis=1)
+    start_money = np.concatenate((np.ones((nb_paths, 1, weights.shape[0])), period_money[:, :-1]), axis=1)
+    nav = float(money) * start_money[:, period] * portfolio_relative
+
+    # Drawdown from the highest value (the initial money included)
+    peak = np.maximum(np.maximum.accumulate(nav, axis=1), float(money))
+    max_drawdown = (nav / peak - 1).min(axis=1)
+
+    return nav[:, -1], max_drawdown
+
+
+def _path_bytes(horizon_days, block_days, nb_assets, nb_strategies):
+    """
+    Bytes used by one path at the peak of a chunk (8-byte values):
+    - bootstrap indexes and the block starts + offsets they come from (2 x days + one block),
+    - paths x days x assets: the resampled returns, their cumulative sums, base[:, period], the difference and its exp,
+    - paths x days x strategies: portfolio_relative, start_money[:, period], the NAV and its product temporary,
+      the running peak and the drawdown temporaries.
+    """
+    return 8 * ((2 * horizon_days + block_days) + 5 * horizon_days * nb_assets + 5 * horizon_days * nb_strategies)
+
+
+def run_monte_carlo(money, rebalance_days, economic_quadrant, horizon_days=252, nb_paths=10000, block_days=20,
+                    strategy_names=None, start_date=None, end_date=None, seed=None, memory_budget_mb=256):
+    """
+    Block-bootstrap Monte Carlo of the quadrant strategies: blocks of historical daily returns (gold, ^GSPC, bonds carry)
+    are resampled into nb_paths synthetic paths of horizon_days trading days, generated as 3-D arrays
+    (paths x days x assets) by chunks that fit in memory_budget_mb, and all the strategies are run on them at once.
+    One call runs the fixed allocation of economic_quadrant over the whole horizon (no switch of quadrant on a path).
+    Return a dict with the terminal wealth and the maximum drawdown of each path (paths x strategies).
+    """
+
+    if rebalance_days < 1:
+        raise ValueError("rebalance_days must be >= 1")
+    if horizon_days < 1 or nb_paths < 1 or block_days < 1:
+        raise ValueError("horizon_days, nb_paths and block_days must be >= 1")
+
+    compiled = strategies_lib.compile_strategies(strategy_names)
+    assets = compiled.quadrant_assets(economic_quadrant)
+    weights = compiled.quadrant_weights(economic_quadrant, assets)
+    history = get_historical_log_returns(economic_quadrant, assets, start_date, end_date)
+
+    # Paths per chunk: all the temporaries of simulate_paths for one path must fit in the budget
+    path_bytes = _path_bytes(horizon_days, min(block_days, len(history)), len(assets), len(weights))
+    chunk_paths = max(1, int(memory_budget_mb * 1024 ** 2 // path_bytes))
+
+    rng = np.random.default_rng(seed)
+    terminal_wealth = np.empty((nb_paths, len(weights)))
+    max_drawdown = np.empty((nb_paths, len(weights)))
+    for first in range(0, nb_paths, chunk_paths):
+        size = min(chunk_paths, nb_paths - first)
+        indexes = block_bootstrap_indexes(rng, len(history), size, horizon_days, block_days)
+        terminal_wealth[first:first + size], max_drawdown[first:first + size] = simulate_paths(
+            history[indexes], weights, money, rebalance_days)
+
+    return {
+        "strategies": compiled.strategy_names,
+        "quadrant": economic_quadrant,
+        "terminal_wealth": terminal_wealth,
+        "max_drawdown": max_drawdown,
+    }
+
+
+def summarize_monte_carlo(results, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)):
+    """
+    Distribution of the terminal wealth and of the maximum drawdown of each strategy (one row per strategy and measure).
+    """
+
+    rows = []
+    for s, name in enumerate(results["strategies"]):
+        for measure in ["terminal_wealth", "max_drawdown"]:
+            values = results[measure][:, s]
+            rows.append({
+                "strategy": name,
+                "measure": measure,
+                "mean": values.mean(),
+                "std": values.std(),
+                **{f"q{q * 100:g}": value for q, value in zip(quantiles, np.quantile(values, quantiles))},
+            })
+
+    return pd.DataFrame(rows)
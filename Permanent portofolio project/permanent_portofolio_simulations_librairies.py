@@ -1,66 +1,58 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import data_modifications_librairies as data_modif
+import quadrant_cache_librairies as quadrant_cache
+import permanent_portofolio_strategies_librairies as strategies_lib
+from instrumentation_librairies import instrument, measure
 
 # Determining inflation and growth ratios
-def get_market_ratios(start_date, end_date):
+def get_market_ratios(start_date, end_date, gold_bonds_offset=0.05):
+
+    # Same computation as the batch with only one window
+    gold_bonds_ratio, gold_equity_ratio = get_market_ratios_batch([start_date], [end_date], gold_bonds_offset)
+
+    # Ensuring values are not NaN
+    if np.isnan(gold_bonds_ratio[0]) or np.isnan(gold_equity_ratio[0]):
+        raise ValueError("Unable to calculate growth ratios due to missing data.")
+
+    return float(gold_bonds_ratio[0]), float(gold_equity_ratio[0])
+
+
+# Determining inflation and growth ratios for many windows at once (NaN when a window has missing data)
+@instrument("simulation: get_market_ratios_batch", rows=lambda result, *args, **kwargs: len(result[0]))
+def get_market_ratios_batch(start_dates, end_dates, gold_bonds_offset=0.05):
 
     # Required tickers
     required_tickers = ['GC=F', '^GSPC', '^FVX', '^TYX']
 
-    # Initialize the dataset with a wider date range to avoid boundary errors
-    start = pd.to_datetime(start_date)
-    end = pd.to_datetime(end_date)
-    start_date_large = start - pd.Timedelta(days=15)
-    end_date_large = end + pd.Timedelta(days=15)
-    data = data_modif.get_economic_for_ratio_data(start_date_large, end_date_large,required_tickers)
-    full_idx = pd.date_range(start_date_large, end_date_large, freq="D")
-    data = data.reindex(full_idx).ffill()
-
-    # Ensuring that the tickers exist in the dataset
-    for ticker in required_tickers:
-        if ticker not in data.columns:
-            raise KeyError(f"Ticker {ticker} is missing from the downloaded data.")
-
-    # Calculating the average bond yield over the period
-    bond_avg = ((data['^FVX'].loc[start_date:end_date].dropna().astype(float).squeeze() + data['^TYX'].loc[start_date:end_date].dropna().astype(float).squeeze()) / 2) / 100
-    data_size = len(bond_avg)
-    data['Bond_Mean'] = bond_avg.rolling(window=data_size).mean()
-
-    # Calculating growth (gold and equity) over the period
-    gold_data = data['GC=F'].loc[start_date:end_date].dropna()
-    gold_growth = (gold_data.iloc[-1] - gold_data.iloc[0]) / gold_data.iloc[0]
-    equity_data = data['^GSPC'].loc[start_date:end_date].dropna()
-    equity_growth = ((equity_data.iloc[-1] - equity_data.iloc[0]) / equity_data.iloc[0])
-
-    # Selecting the last value as a scalar
-    last_gold_growth = gold_growth
-    last_bonds_mean = data['Bond_Mean'].dropna().iloc[-1] if not data['Bond_Mean'].dropna().empty else np.nan
-    last_equity_growth = equity_growth
-
-    # Calculation number of days
-    num_days = (pd.to_datetime(end_date) - pd.to_datetime(start_date)).days
-
-    # Calculating the daily interest rate with compounding
-    annual_interest_rate = last_bonds_mean / 100
-    daily_interest_rate = (1 + annual_interest_rate) ** (1 / 365) - 1
-    last_bonds_growth = ((1 + daily_interest_rate) ** num_days - 1)*100
-
-    # print(f"📊 Last gold growth (US Dollar) over {num_days} days: {last_gold_growth*100:.2f}%")
-    # print(f"📈 Last growth of IWLE.DE (MSCI World in US Dollar) over {num_days} days: {last_equity_growth*100:.2f}%")
-    # print(f"💰 Average US bond yields (US Dollar) (average of 5-year and 15-year rates) over {num_days} days: {last_bonds_mean*100:.2f}%")
-    # print(f"📉 Last bond growth (average of 5-year and 15-year US rates) over {num_days} days: {last_bonds_growth*100:.2f}%")
+    start_dates = pd.DatetimeIndex(pd.to_datetime(start_dates))
+    end_dates = pd.DatetimeIndex(pd.to_datetime(end_dates))
+    if len(start_dates) != len(end_dates):
+        raise ValueError("start_dates and end_dates must have the same length")
+
+    # Daily forward-filled panel (built once), each window is only a range of rows
+    # (the values must come from dates after start_date - 15 days, like the old reindex on a wider range)
+    panel = data_modif.get_daily_panel(required_tickers)
+
+    # Calculating growth (gold and equity) over each period (from the log-price index)
+    last_gold_growth = panel.growth('GC=F', start_dates, end_dates, margin_days=15)
+    last_equity_growth = panel.growth('^GSPC', start_dates, end_dates, margin_days=15)
+
+    # Calculating the bond growth (carry of the average of the 5-year and 30-year US rates, compounded average yield)
+    last_bonds_growth = panel.growth(data_modif.BOND_CARRY, start_dates, end_dates, margin_days=15)
+
+    # print(f"📊 Last gold growth (US Dollar): {last_gold_growth*100:.2f}%")
+    # print(f"📈 Last growth of IWLE.DE (MSCI World in US Dollar): {last_equity_growth*100:.2f}%")
+    # print(f"📉 Last bond growth (average of 5-year and 30-year US rates): {last_bonds_growth*100:.2f}%")
     # print('\n\n')
 
-    # Ensuring values are not NaN
-    if np.isnan(last_gold_growth) or np.isnan(last_bonds_growth) or np.isnan(last_equity_growth):
-        raise ValueError("Unable to calculate growth ratios due to missing data.")
+    # Windows with a NaN value
+    missing = np.isnan(last_gold_growth) | np.isnan(last_bonds_growth) | np.isnan(last_equity_growth)
 
     # Calculating growth ratios (change with the strategy)
     #gold_bonds_ratio = float(last_gold_growth / last_bonds_growth) if last_bonds_mean != 0 else np.nan
-    gold_bonds_ratio = float(last_gold_growth)-0.05
-    gold_equity_ratio = float(last_gold_growth - last_equity_growth)
+    gold_bonds_ratio = np.where(missing, np.nan, last_gold_growth - gold_bonds_offset)
+    gold_equity_ratio = np.where(missing, np.nan, last_gold_growth - last_equity_growth)
 
     # Adjusting negative ratios to avoid sign errors
     # if last_gold_growth < 0 and last_bonds_growth > 0 :
@@ -76,44 +68,45 @@ def get_market_ratios(start_date, end_date):
 
 
 # Determining the economic quadrant
-def determine_quadrant(gold_bonds_ratio, gold_equity_ratio):
+def determine_quadrant(gold_bonds_ratio, gold_equity_ratio, bonds_threshold=0, equity_threshold=5):
 
-    if gold_bonds_ratio > 0 and gold_equity_ratio > 5:
+    if gold_bonds_ratio > bonds_threshold and gold_equity_ratio > equity_threshold:
         return "Quadrant 1: Inflationary Bust"
-    elif gold_bonds_ratio > 0 and gold_equity_ratio < 5:
+    elif gold_bonds_ratio > bonds_threshold and gold_equity_ratio < equity_threshold:
         return "Quadrant 2: Inflationary Boom"
-    elif gold_bonds_ratio < 0 and gold_equity_ratio > 5:
+    elif gold_bonds_ratio < bonds_threshold and gold_equity_ratio > equity_threshold:
         return "Quadrant 3: Deflationary Bust"
-    elif gold_bonds_ratio < 0 and gold_equity_ratio < 5:
+    elif gold_bonds_ratio < bonds_threshold and gold_equity_ratio < equity_threshold:
         return "Quadrant 4: Deflationary Boom"
     else :
         return "Quadrant 5: Transition Quadrant"
 
 
-# determine the return of the strategy
-def get_return_of_investments(money,rebalance_days,economic_quadrant,start_date,end_date):
+# Determining the economic quadrant of arrays of ratios (same rules as determine_quadrant)
+@instrument("simulation: determine_quadrant_batch", rows=lambda result, *args, **kwargs: len(result))
+def determine_quadrant_batch(gold_bonds_ratio, gold_equity_ratio, bonds_threshold=0, equity_threshold=5):
 
-    # Dictionary of assets by quadrant
-    quadrants_tickers = {
-        "Quadrant 1: Inflationary Bust": ['GC=F', '^GSPC'],
-        "Quadrant 2: Inflationary Boom": ['GC=F', '^GSPC'],
-        "Quadrant 3: Deflationary Bust": ['^FVX', '^TYX', '^GSPC'],
-        "Quadrant 4: Deflationary Boom": ['^FVX', '^TYX', '^GSPC'],
-    }
+    gold_bonds_ratio = np.asarray(gold_bonds_ratio, dtype=float)
+    gold_equity_ratio = np.asarray(gold_equity_ratio, dtype=float)
 
-    # Check the economic_quadrant
-    if economic_quadrant not in quadrants_tickers:
-        raise ValueError(f"Error: Invalid quadrant ({economic_quadrant})")
+    conditions = [
+        (gold_bonds_ratio > bonds_threshold) & (gold_equity_ratio > equity_threshold),
+        (gold_bonds_ratio > bonds_threshold) & (gold_equity_ratio < equity_threshold),
+        (gold_bonds_ratio < bonds_threshold) & (gold_equity_ratio > equity_threshold),
+        (gold_bonds_ratio < bonds_threshold) & (gold_equity_ratio < equity_threshold),
+    ]
+    choices = [
+        "Quadrant 1: Inflationary Bust",
+        "Quadrant 2: Inflationary Boom",
+        "Quadrant 3: Deflationary Bust",
+        "Quadrant 4: Deflationary Boom",
+    ]
 
-    # Init required tickers
-    required_tickers = quadrants_tickers[economic_quadrant]
+    return np.select(conditions, choices, default="Quadrant 5: Transition Quadrant").astype(object)
 
-    # Convert input dates to datetime objects
-    start = pd.to_datetime(start_date)
-    end = pd.to_datetime(end_date)
 
-    # Compute the total number of days in the period
-    nb_days = (end - start).days
+# Rebalancing dates between start and end (both included) every rebalance_days days
+def _rebalancing_dates(start, end, rebalance_days):
 
     # Check rebalance_days
     if rebalance_days < 1:
@@ -123,99 +116,213 @@ def get_return_of_investments(money,rebalance_days,economic_quadrant,start_date,
     rebal_dates = list(pd.date_range(start=start, end=end, freq=f"{rebalance_days}D"))
 
     # Ensure the start date is included
-    if rebal_dates[0] != start:
+    if not rebal_dates or rebal_dates[0] != start:
         rebal_dates = [start] + rebal_dates
 
     # Ensure the end date is included
     if rebal_dates[-1] != end:
         rebal_dates.append(end)
 
-    # Initialize the dataset with a wider date range to avoid boundary errors
-    start_date_large = start - pd.Timedelta(days=15)
-    end_date_large = end + pd.Timedelta(days=15)
-    data = data_modif.get_economic_cadran_data(economic_quadrant, start_date_large, end_date_large)
-    full_idx = pd.date_range(start_date_large, end_date_large, freq="D")
-    data = data.reindex(full_idx).ffill()
+    return rebal_dates
+
+
+# Rows of the daily panel between the first and the last rebalancing date (window sliced by get_assets_returns)
+def _window_days(result, assets, economic_quadrant, rebal_dates):
+    return (rebal_dates[-1] - rebal_dates[0]).days + 1
 
 
-    # Check that the required tickers exist in the data
-    for ticker in required_tickers:
-        if ticker not in data.columns:
-            raise KeyError(f"Ticker {ticker} is missing from the downloaded data.")
+# Growth of the assets of a quadrant on each rebalancing sub-period (asset-return matrix: sub-periods x assets)
+@instrument("simulation: asset returns lookup (get_assets_returns)", rows=_window_days)
+def get_assets_returns(assets, economic_quadrant, rebal_dates):
+
+    # Check the economic_quadrant
+    if economic_quadrant not in strategies_lib.QUADRANTS_TICKERS:
+        raise ValueError(f"Error: Invalid quadrant ({economic_quadrant})")
 
-    # Loop over the rebalancing sub-periods
-    performance_factor = 1.0
+    # Daily panel built once (the values must come from dates after start - 15 days to avoid boundary errors)
+    start_date_large = rebal_dates[0] - pd.Timedelta(days=15)
+    panel = data_modif.get_daily_panel(strategies_lib.QUADRANTS_TICKERS[economic_quadrant])
 
-    for i in range(len(rebal_dates) - 1):
+    # Growth of each sub-period: two reads of the log-price index (cumulative yield sums for the bonds)
+    asset_returns = np.column_stack(
+        [panel.growth(asset, rebal_dates[:-1], rebal_dates[1:], valid_from=start_date_large) for asset in assets]
+    ) if assets else np.zeros((len(rebal_dates) - 1, 0))
 
-        date_start_rebal = rebal_dates[i]
-        date_end_rebal   = rebal_dates[i + 1]
+    # A sub-period without data cannot be computed
+    if np.isnan(asset_returns).any():
+        raise ValueError("Unable to calculate the growth: no data on a rebalancing period.")
 
-        # Calculation range periods
-        num_days = (pd.to_datetime(date_end_rebal) - pd.to_datetime(date_start_rebal)).days
-        data_size = max(num_days, 1)  # avoid zero-length windows
+    return asset_returns
+
+
+# determine the return of several strategies at once on the same asset-return matrix
+def get_return_of_strategies(money, rebalance_days, economic_quadrant, start_date, end_date, strategy_names=None):
+
+    compiled = strategies_lib.compile_strategies(strategy_names)
+
+    # Create the rebalancing dates based on the chosen frequency
+    rebal_dates = _rebalancing_dates(pd.to_datetime(start_date), pd.to_datetime(end_date), rebalance_days)
 
-        if economic_quadrant == "Quadrant 3: Deflationary Bust" or economic_quadrant == "Quadrant 4: Deflationary Boom":
+    # Asset-return matrix (sub-periods x assets) and weight matrix (strategies x assets) of the quadrant
+    assets = compiled.quadrant_assets(economic_quadrant)
+    asset_returns = get_assets_returns(assets, economic_quadrant, rebal_dates)
+    weights = compiled.quadrant_weights(economic_quadrant, assets)
 
-             # Compute the average bond yield over the period (simple average of FVX and TYX, in decimal form)
-            bond_avg = ((data['^FVX'].loc[date_start_rebal:date_end_rebal].astype(float).squeeze() + data['^TYX'].loc[date_start_rebal:date_end_rebal].astype(float).squeeze()) / 2) / 100
+    # Return of each strategy on each sub-period, then compound the sub-periods (measured apart from the lookup)
+    with measure("simulation: compounding (get_return_of_strategies)", rows=len(asset_returns)):
+        periods_return = asset_returns @ weights.T
+        performance_factor = np.cumprod(1 + periods_return, axis=0)[-1] if len(periods_return) else np.ones(len(weights))
 
-            # Smooth bond yield with a rolling average
-            bond_avg_period = (bond_avg.loc[date_start_rebal:date_end_rebal].rolling(window=data_size, min_periods=1).mean())
-            last_bonds_mean = bond_avg_period.iloc[-1] if hasattr(bond_avg_period, 'iloc') and len(bond_avg_period) else 0.0
+        final_money = float(money) * performance_factor
+        performance_percentage = (final_money / float(money) - 1.0) * 100.0
+        margin_calls = compiled.margin_calls(economic_quadrant, assets, asset_returns)
 
-            # Compute daily compounded interest rate (in decimal form)
-            annual_interest_rate = last_bonds_mean
-            daily_interest_rate  = (1 + annual_interest_rate) ** (1 / 365) - 1
-            last_bonds_growth    = (1 + daily_interest_rate) ** num_days - 1
+    return final_money, performance_percentage, margin_calls
 
-        if economic_quadrant == "Quadrant 1: Inflationary Bust" or economic_quadrant == "Quadrant 2: Inflationary Boom":
 
-            # Compute gold growth over the period (in decimal form)
-            gold_data = data['GC=F'].loc[date_start_rebal:date_end_rebal].dropna()
-            last_gold_growth = (gold_data.iloc[-1] - gold_data.iloc[0]) / gold_data.iloc[0]
+# determine the return of the strategy (verbose=False: the margin calls are not printed)
+def get_return_of_investments(money,rebalance_days,economic_quadrant,start_date,end_date,strategy=strategies_lib.DEFAULT_STRATEGY,verbose=True):
 
+    # Same computation as the strategies with only one strategy
+    final_money, performance_percentage, margin_calls = get_return_of_strategies(
+        money, rebalance_days, economic_quadrant, start_date, end_date, [strategy])
 
-        if economic_quadrant == "Quadrant 2: Inflationary Boom" or economic_quadrant == "Quadrant 4: Deflationary Boom":
+    if verbose:
+        for _ in range(int(margin_calls[0])):
+            print(strategies_lib.MARGIN_CALL_MESSAGE)
 
-            # Compute equity growth (S&P 500) over the period (in decimal form)
-            equity_data = data['^GSPC'].loc[date_start_rebal:date_end_rebal].dropna()
-            last_equity_growth = ((equity_data.iloc[-1] - equity_data.iloc[0]) / equity_data.iloc[0])
+    return float(final_money[0]), float(performance_percentage[0]), economic_quadrant
 
-        # Apply performance rules depending on the economic quadrant
-        if economic_quadrant == "Quadrant 1: Inflationary Bust" :
-            performance_factor = performance_factor * (1 + last_gold_growth)
-        if economic_quadrant == "Quadrant 2: Inflationary Boom" :
-            performance_factor = performance_factor * (1 + (0.5 * last_gold_growth + 0.5 * last_equity_growth))
-            if last_equity_growth < -0.16666 or last_gold_growth < -0.16666:
-                print('appel_de_marge_6')
-        if economic_quadrant == "Quadrant 3: Deflationary Bust":
-            performance_factor = performance_factor * (1 + last_bonds_growth)
-        if economic_quadrant == "Quadrant 4: Deflationary Boom":
-            performance_factor = performance_factor * (1 + (0.5 * last_bonds_growth + 0.5 * last_equity_growth))
 
-    final_money = float(money) * performance_factor
-    performance_percentage = (final_money / float(money) - 1.0) * 100.0
+# Daily net asset value of the strategy: the holdings drift with the prices between two rebalancing dates
+@instrument("simulation: get_daily_nav", rows=lambda result, *args, **kwargs: len(result))
+def get_daily_nav(money, rebalance_days, economic_quadrant, start_date, end_date, strategy=strategies_lib.DEFAULT_STRATEGY):
 
-    return final_money, performance_percentage, economic_quadrant
+    # Weights of the assets of the quadrant (bonds = carry of the average of FVX and TYX)
+    compiled = strategies_lib.compile_strategies([strategy])
+    assets = compiled.quadrant_assets(economic_quadrant)
+    weights = compiled.quadrant_weights(economic_quadrant, assets)[0]
+
+    # Daily prices between start and end (forward-filled, like get_return_of_investments)
+    start = pd.to_datetime(start_date)
+    end = pd.to_datetime(end_date)
+    start_date_large = start - pd.Timedelta(days=15)
+    panel = data_modif.get_daily_panel(strategies_lib.QUADRANTS_TICKERS[economic_quadrant])
+
+    # Price index of each asset (days x assets), the bonds use the carry index (average yield of the day accrued every day)
+    prices = np.column_stack([panel.price_index(asset, start, end, valid_from=start_date_large) for asset in assets])
+    if np.isnan(prices).any():
+        raise ValueError("Unable to calculate the daily NAV due to missing data.")
+
+    # Row of each rebalancing date and sub-period of each day (a rebalancing day closes the previous sub-period)
+    rebal_rows = (pd.DatetimeIndex(_rebalancing_dates(start, end, rebalance_days)) - start).days.to_numpy()
+    days = np.arange(len(prices))
+    period = np.clip(np.searchsorted(rebal_rows, days, side="left") - 1, 0, None)
+
+    # Value of the portfolio at each rebalancing date (all the sub-periods at once)
+    period_growth = (prices[rebal_rows[1:]] / prices[rebal_rows[:-1]]) @ weights
+    rebal_money = float(money) * np.concatenate(([1.0], np.cumprod(period_growth)))
+
+    # Holdings drift with the prices from the start of their sub-period
+    base_prices = prices[rebal_rows[period]]
+    units = rebal_money[period][:, None] * weights[None, :] / base_prices
+    holdings = units * prices
+    nav = holdings.sum(axis=1)
+
+    # Contribution of each asset to the daily P&L (the units held during the day times the price change)
+    contributions = np.zeros_like(holdings)
+    contributions[1:] = units[1:] * (prices[1:] - prices[:-1])
+
+    daily_nav = pd.DataFrame(index=pd.date_range(start, end, freq="D"))
+    daily_nav["nav"] = nav
+    daily_nav["drawdown"] = nav / np.maximum.accumulate(nav) - 1
+    for j, asset in enumerate(assets):
+        daily_nav[f"{asset}_holding"] = holdings[:, j]
+        daily_nav[f"{asset}_weight"] = holdings[:, j] / nav
+        daily_nav[f"{asset}_contribution"] = contributions[:, j]
+
+    return daily_nav
 
 # Compute volatility of assets
 def volatility(start_date, end_date):
 
-    # Quadrant of the assets where we calculate the volatility (where we look for gold or equity) so take quadrant 2
-    quadrant = "Quadrant 2: Inflationary Boom"
+    # Same computation as the batch with only one window
+    vols_gold, vols_equity = volatility_batch([start_date], [end_date])
 
-    # Initialize data
-    data = data_modif.get_economic_cadran_data(quadrant, start_date, end_date)
+    return vols_gold[0], vols_equity[0]
 
-    # Compute volatility gold
-    returns_gold = data['GC=F'].pct_change()
-    vol_gold = returns_gold.std() * (len(returns_gold) ** 0.5)
 
-    # Compute volatility equity
-    returns_equity = data['^GSPC'].pct_change()
-    vol_equity = returns_equity.std() * (len(returns_equity) ** 0.5)
+# Compute volatility of assets for many windows at once (prefix sums built once, constant time per window)
+@instrument("simulation: volatility_batch", rows=lambda result, *args, **kwargs: len(result[0]))
+def volatility_batch(start_dates, end_dates):
+
+    # Assets of quadrant 2 (where we look for gold or equity): the dates where both have a value
+    volatility_index = data_modif.get_volatility_index(['GC=F', '^GSPC'])
 
+    # Compute volatility gold
+    vols_gold = volatility_index.volatility_batch('GC=F', start_dates, end_dates)
 
+    # Compute volatility equity
+    vols_equity = volatility_index.volatility_batch('^GSPC', start_dates, end_dates)
+
+    return vols_gold, vols_equity
+
+
+# Run the strategy year after year without any display (used by simulation() and by the sweeps)
+# verbose=False: the margin calls are not printed either
+@instrument("simulation: run_simulation", rows=lambda result, *args, **kwargs: len(result["years"]))
+def run_simulation(annees, lookback_years, rebalance_days, money, forced_quadrant="Quadrant 2: Inflationary Boom",
+                   bonds_threshold=0, equity_threshold=5, gold_bonds_offset=0.05, verbose=True):
+
+    results = {
+        "years": [],
+        "gb_ratios": [],
+        "ge_ratios": [],
+        "quadrants": [],
+        "money_finals": [],
+        "perfs": [],
+        "vols_gold": [],
+        "vols_equity": [],
+    }
 
-    return vol_gold, vol_equity
\ No newline at end of file
+    # Init money
+    final_money = money
+
+    for a in annees:
+        y = int(a)
+        # Fenêtre pour les ratios
+        ratio_start = f"{y - lookback_years}-01-01"
+        ratio_end   = f"{y}-01-01"
+        # Fenêtre pour la perf de l'année
+        year_start  = f"{y}-01-01"
+        year_end    = f"{y+1}-01-01"
+
+        # 1) Ratios & cadran basé sur la fenêtre lookback (cached: the same windows come back between runs)
+        gold_bonds_ratio, gold_equity_ratio, quadrant = quadrant_cache.classify_window(
+            ratio_start, ratio_end, bonds_threshold, equity_threshold, gold_bonds_offset)
+
+        # Test: the strategy can be forced on one quadrant (None = detected quadrant)
+        if forced_quadrant is not None:
+            quadrant = forced_quadrant
+
+        # Compute money and performance (Quadrant 5: keep the money, change with the strategy)
+        if quadrant == "Quadrant 5: Transition Quadrant":
+            performance_pct = 1
+        else:
+            final_money, performance_pct, _ = get_return_of_investments(final_money, rebalance_days, quadrant, year_start, year_end,
+                                                                        verbose=verbose)
+
+        # Compute volatility
+        vol_gold, vol_equity = volatility(year_start, year_end)
+
+        # Add elements to the lists
+        results["years"].append(y)
+        results["gb_ratios"].append(gold_bonds_ratio)
+        results["ge_ratios"].append(gold_equity_ratio)
+        results["quadrants"].append(str(quadrant))
+        results["money_finals"].append(final_money)
+        results["perfs"].append(performance_pct)
+        results["vols_gold"].append(vol_gold)
+        results["vols_equity"].append(vol_equity)
+
+    return results
@@ -0,0 +1,103 @@
+import numpy as np
+
+# Tickers used by each quadrant: only the dates where all of them have a value are used
+QUADRANTS_TICKERS = {
+    "Quadrant 1: Inflationary Bust": ['GC=F', '^GSPC'],
+    "Quadrant 2: Inflationary Boom": ['GC=F', '^GSPC'],
+    "Quadrant 3: Deflationary Bust": ['^FVX', '^TYX', '^GSPC'],
+    "Quadrant 4: Deflationary Boom": ['^FVX', '^TYX', '^GSPC'],
+}
+
+# Tickers needed by each asset ("bonds" = carry of the average of ^FVX and ^TYX)
+ASSETS_TICKERS = {
+    'GC=F': ['GC=F'],
+    '^GSPC': ['^GSPC'],
+    'bonds': ['^FVX', '^TYX'],
+}
+
+# Strategies: for each quadrant the weights of the assets and the margin call threshold
+# (a sub-period where an asset of the quadrant loses more than the threshold prints the margin call message)
+STRATEGIES = {
+    "permanent_portfolio": {
+        "Quadrant 1: Inflationary Bust": {"weights": {'GC=F': 1.0}},
+        "Quadrant 2: Inflationary Boom": {"weights": {'GC=F': 0.5, '^GSPC': 0.5}, "margin_call_threshold": -0.16666},
+        "Quadrant 3: Deflationary Bust": {"weights": {'bonds': 1.0}},
+        "Quadrant 4: Deflationary Boom": {"weights": {'bonds': 0.5, '^GSPC': 0.5}},
+    },
+}
+
+DEFAULT_STRATEGY = "permanent_portfolio"
+MARGIN_CALL_MESSAGE = 'appel_de_marge_6'
+
+
+class CompiledStrategies:
+    """
+    Strategies compiled into arrays:
+    - weights[s, q, a]: weight of the asset a in the quadrant q for the strategy s,
+    - margin_call_thresholds[s, q]: threshold of the margin call (NaN = no margin call).
+    """
+
+    def __init__(self, strategy_names, strategies):
+        self.strategy_names = list(strategy_names)
+        self.quadrants = list(QUADRANTS_TICKERS)
+        self.assets = list(ASSETS_TICKERS)
+
+        self.weights = np.zeros((len(self.strategy_names), len(self.quadrants), len(self.assets)))
+        self.margin_call_thresholds = np.full((len(self.strategy_names), len(self.quadrants)), np.nan)
+
+        for s, name in enumerate(self.strategy_names):
+            if name not in strategies:
+                raise ValueError(f"Error: Invalid strategy ({name})")
+            for quadrant, rules in strategies[name].items():
+                if quadrant not in self.quadrants:
+                    raise ValueError(f"Error: Invalid quadrant ({quadrant}) in the strategy {name}")
+                q = self.quadrants.index(quadrant)
+                for asset, weight in rules["weights"].items():
+                    # The asset must be computable with the tickers of the quadrant
+                    if asset not in ASSETS_TICKERS or not set(ASSETS_TICKERS[asset]) <= set(QUADRANTS_TICKERS[quadrant]):
+                        raise ValueError(f"Error: asset {asset} is not available in {quadrant} (strategy {name})")
+                    self.weights[s, q, self.assets.index(asset)] = weight
+                self.margin_call_thresholds[s, q] = rules.get("margin_call_threshold", np.nan)
+
+    def quadrant_position(self, economic_quadrant):
+        if economic_quadrant not in self.quadrants:
+            raise ValueError(f"Error: Invalid quadrant ({economic_quadrant})")
+        return self.quadrants.index(economic_quadrant)
+
+    def quadrant_assets(self, economic_quadrant):
+        """
+        Assets with a weight in this quadrant for at least one strategy.
+        """
+        q = self.quadrant_position(economic_quadrant)
+        return [asset for a, asset in enumerate(self.assets) if np.any(self.weights[:, q, a] != 0)]
+
+    def quadrant_weights(self, economic_quadrant, assets):
+        """
+        Weight matrix (strategies x assets) of a quadrant for the given assets.
+        """
+        q = self.quadrant_position(economic_quadrant)
+        return self.weights[:, q, [self.assets.index(asset) for asset in assets]]
+
+    def margin_calls(self, economic_quadrant, assets, asset_returns):
+        """
+        Number of sub-periods with a margin call for each strategy (asset_returns: sub-periods x assets).
+        """
+        q = self.quadrant_position(economic_quadrant)
+        weights = self.quadrant_weights(economic_quadrant, assets)
+        thresholds = self.margin_call_thresholds[:, q]
+
+        # A sub-period calls the margin when one of the assets held by the strategy is under the threshold
+        with np.errstate(invalid="ignore"):
+            below = (asset_returns[:, None, :] < thresholds[None, :, None]) & (weights[None, :, :] != 0)
+        return below.any(axis=2).sum(axis=0)
+
+
+def compile_strategies(strategy_names=None, strategies=None):
+    """
+    Compile strategies of the table (default: all the strategies of STRATEGIES) into weight matrices.
+    """
+    if strategies is None:
+        strategies = STRATEGIES
+    if strategy_names is None:
+        strategy_names = list(strategies)
+    return CompiledStrategies(strategy_names, strategies)
@@ -0,0 +1,110 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import data_modifications_librairies as data_modif
+import permanent_portofolio_simulations_librairies as lib
+
+
+def build_configurations(lookback_years_grid, rebalance_days_grid, years_grid, money_grid):
+    """
+    All the combinations of the grids. years_grid is a list of lists of years (ex: [range(2005, 2015), range(2015, 2025)]).
+    """
+
+    configurations = []
+    for config_id, (lookback_years, rebalance_days, annees, money) in enumerate(
+            itertools.product(lookback_years_grid, rebalance_days_grid, years_grid, money_grid)):
+        configurations.append({
+            "config_id": config_id,
+            "lookback_years": int(lookback_years),
+            "rebalance_days": int(rebalance_days),
+            "years": [int(a) for a in annees],
+            "money": float(money),
+        })
+
+    return configurations
+
+
+def _init_worker():
+    """
+    Load the dataset and build the daily panels once per worker.
+    With fork the panel of the parent is reused as is (copy-on-write), otherwise each worker reads its own
+    in-memory copy of the dataset from the store (get_dataset) before building the panels.
+    """
+    data_modif.get_daily_panel(['GC=F', '^GSPC', '^FVX', '^TYX'])
+
+
+def run_configuration(configuration, forced_quadrant="Quadrant 2: Inflationary Boom", verbose=False):
+    """
+    Run one configuration and return its rows (one row per year) with the time it took.
+    verbose=False: the margin calls are not printed (the workers would interleave their messages).
+    """
+
+    start_time = time.perf_counter()
+    try:
+        results = lib.run_simulation(configuration["years"], configuration["lookback_years"],
+                                     configuration["rebalance_days"], configuration["money"], forced_quadrant,
+                                     verbose=verbose)
+        error = None
+    except Exception as e:
+        results = None
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start_time
+
+    config_columns = {
+        "config_id": configuration["config_id"],
+        "lookback_years": configuration["lookback_years"],
+        "rebalance_days": configuration["rebalance_days"],
+        "first_year": configuration["years"][0] if configuration["years"] else None,
+        "last_year": configuration["years"][-1] if configuration["years"] else None,
+        "money_start": configuration["money"],
+        "elapsed_s": elapsed,
+        "error": error,
+    }
+
+    # A configuration that failed keeps one row with its error
+    if results is None or not results["years"]:
+        return [config_columns]
+
+    rows = []
+    for i, year in enumerate(results["years"]):
+        rows.append({
+            **config_columns,
+            "year": year,
+            "quadrant": results["quadrants"][i],
+            "gold_bonds_ratio": results["gb_ratios"][i],
+            "gold_equity_ratio": results["ge_ratios"][i],
+            "money": results["money_finals"][i],
+            "performance_pct": results["perfs"][i],
+            "vol_gold": results["vols_gold"][i],
+            "vol_equity": results["vols_equity"][i],
+        })
+
+    return rows
+
+
+def run_sweep(lookback_years_grid, rebalance_days_grid, years_grid, money_grid, max_workers=None,
+              forced_quadrant="Quadrant 2: Inflationary Boom"):
+    """
+    Run all the configurations of the grids in a process pool and return one tidy DataFrame
+    (one row per configuration and year, with the time of each configuration in elapsed_s).
+    max_workers=1 runs everything in the current process.
+    """
+
+    configurations = build_configurations(lookback_years_grid, rebalance_days_grid, years_grid, money_grid)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers == 1 or len(configurations) <= 1:
+        _init_worker()
+        all_rows = [run_configuration(configuration, forced_quadrant) for configuration in configurations]
+    else:
+        # Build the panel before the workers are started so that forked workers share it
+        _init_worker()
+        chunksize = max(1, len(configurations) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            all_rows = list(executor.map(run_configuration, configurations,
+                                         itertools.repeat(forced_quadrant), chunksize=chunksize))
+
+    return pd.DataFrame([row for rows in all_rows for row in rows])
@@ -0,0 +1,27 @@
+import os
+import time
+import permanent_portofolio_sweep_librairies as sweep
+
+# The table is written next to this script whatever the working directory
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "permanent_portofolio_sweep_results.csv")
+
+if __name__ == "__main__":
+
+    # Grids of parameters
+    lookback_years_grid = [3, 5, 7, 10]
+    rebalance_days_grid = [1, 7, 30, 90]
+    years_grid = [list(range(2010, 2018)), list(range(2018, 2025))]
+    money_grid = [15*2*700]
+
+    # Run all the configurations in parallel
+    start_time = time.perf_counter()
+    results = sweep.run_sweep(lookback_years_grid, rebalance_days_grid, years_grid, money_grid)
+    print(f"{results['config_id'].nunique()} configurations in {time.perf_counter() - start_time:.2f} s")
+
+    # Final money of each configuration
+    last_rows = results.dropna(subset=["year"]).sort_values("year").groupby("config_id").tail(1)
+    print(last_rows[["lookback_years", "rebalance_days", "first_year", "last_year", "money", "elapsed_s"]].sort_values("money"))
+
+    # Save the table
+    results.to_csv(RESULTS_PATH, index=False)
+    print("Results saved:", RESULTS_PATH)
@@ -0,0 +1,168 @@
+import itertools
+import numpy as np
+import pandas as pd
+import data_modifications_librairies as data_modif
+import permanent_portofolio_simulations_librairies as lib
+import permanent_portofolio_strategies_librairies as strategies_lib
+import quadrant_cache_librairies as quadrant_cache
+
+# Quadrants in the columns of the yearly returns (Quadrant 5 keeps the money: return 0)
+QUADRANTS = list(strategies_lib.QUADRANTS_TICKERS) + ["Quadrant 5: Transition Quadrant"]
+
+
+def build_candidates(bonds_threshold_grid, equity_threshold_grid, gold_bonds_offset_grid, lookback_years_grid):
+    """
+    All the combinations of the thresholds and lookbacks (one dict per candidate).
+    """
+
+    candidates = []
+    for candidate_id, (bonds_threshold, equity_threshold, gold_bonds_offset, lookback_years) in enumerate(
+            itertools.product(bonds_threshold_grid, equity_threshold_grid, gold_bonds_offset_grid, lookback_years_grid)):
+        candidates.append({
+            "candidate_id": candidate_id,
+            "bonds_threshold": float(bonds_threshold),
+            "equity_threshold": float(equity_threshold),
+            "gold_bonds_offset": float(gold_bonds_offset),
+            "lookback_years": int(lookback_years),
+        })
+
+    return candidates
+
+
+def get_yearly_returns(years, rebalance_days):
+    """
+    Return of each quadrant strategy for each year (years x quadrants), NaN when a year cannot be computed.
+    Computed once and shared by all the candidates: a candidate only chooses a column per year.
+    The rebalancing sub-periods of all the years are read in one growth call per asset, then compounded year by year.
+    """
+
+    compiled = strategies_lib.compile_strategies()
+
+    # Sub-periods of all the years one after the other (first_period: position of the first sub-period of each year)
+    starts, ends, valid_from, first_period = [], [], [], []
+    for y in years:
+        rebal_dates = lib._rebalancing_dates(pd.Timestamp(f"{y}-01-01"), pd.Timestamp(f"{y+1}-01-01"), rebalance_days)
+        first_period.append(len(starts))
+        starts += rebal_dates[:-1]
+        ends += rebal_dates[1:]
+        valid_from += [rebal_dates[0] - pd.Timedelta(days=15)] * (len(rebal_dates) - 1)
+
+    yearly_returns = np.zeros((len(years), len(QUADRANTS)))
+    for j, quadrant in enumerate(QUADRANTS[:-1]):
+        assets = compiled.quadrant_assets(quadrant)
+        weights = compiled.quadrant_weights(quadrant, assets)[0]
+        panel = data_modif.get_daily_panel(strategies_lib.QUADRANTS_TICKERS[quadrant])
+
+        # A sub-period without data gives NaN for its year (same as the ValueError of get_return_of_strategies)
+        asset_returns = np.column_stack([panel.growth(asset, starts, ends, valid_from=valid_from) for asset in assets])
+        yearly_returns[:, j] = np.multiply.reduceat(1 + asset_returns @ weights, first_period) - 1
+
+    return yearly_returns
+
+
+def get_lookback_ratios(years, lookback_years_grid, gold_bonds_offset_grid):
+    """
+    Ratios of the lookback windows of each year, for each (lookback, offset): computed once through the quadrant cache
+    (classify_windows) and shared by all the thresholds. NaN when a window has missing data.
+    """
+
+    ratios = {}
+    ends = [f"{y}-01-01" for y in years]
+    for lookback_years, gold_bonds_offset in itertools.product(lookback_years_grid, gold_bonds_offset_grid):
+        starts = [f"{y - lookback_years}-01-01" for y in years]
+        gold_bonds_ratio, gold_equity_ratio, _ = quadrant_cache.classify_windows(
+            starts, ends, gold_bonds_offset=gold_bonds_offset)
+        ratios[(int(lookback_years), float(gold_bonds_offset))] = (gold_bonds_ratio, gold_equity_ratio)
+
+    return ratios
+
+
+def score_candidates(candidates, ratios, yearly_returns):
+    """
+    Return of each candidate for each year (candidates x years): the quadrant of the year is given by the thresholds,
+    the return is the one of that quadrant. NaN when the ratios or the return of the year are missing.
+    All the candidates are classified at once (ratios and thresholds stacked into candidates x years arrays).
+    """
+
+    shape = (len(candidates), yearly_returns.shape[0])
+
+    # Ratios of the lookback and offset of each candidate, thresholds as columns
+    keys = [(candidate["lookback_years"], candidate["gold_bonds_offset"]) for candidate in candidates]
+    gold_bonds_ratio = np.array([ratios[key][0] for key in keys], dtype=float).reshape(shape)
+    gold_equity_ratio = np.array([ratios[key][1] for key in keys], dtype=float).reshape(shape)
+    bonds_threshold = np.array([candidate["bonds_threshold"] for candidate in candidates], dtype=float)[:, None]
+    equity_threshold = np.array([candidate["equity_threshold"] for candidate in candidates], dtype=float)[:, None]
+
+    # Quadrant of each candidate and year, then the column of its return
+    quadrants = lib.determine_quadrant_batch(gold_bonds_ratio, gold_equity_ratio, bonds_threshold, equity_threshold)
+    columns = pd.Index(QUADRANTS).get_indexer(quadrants.ravel()).reshape(shape)
+    missing = np.isnan(gold_bonds_ratio) | np.isnan(gold_equity_ratio)
+
+    return np.where(missing, np.nan, yearly_returns[np.arange(shape[1])[None, :], columns])
+
+
+def walk_forward_folds(years, train_years, test_years):
+    """
+    Rolling folds: (positions of the in-sample years, positions of the out-of-sample years that follow them).
+    """
+
+    folds = []
+    for first in range(0, len(years) - train_years - test_years + 1, test_years):
+        train = np.arange(first, first + train_years)
+        test = np.arange(first + train_years, first + train_years + test_years)
+        folds.append((train, test))
+
+    return folds
+
+
+def run_walk_forward(years, rebalance_days, bonds_threshold_grid, equity_threshold_grid, gold_bonds_offset_grid,
+                     lookback_years_grid, train_years=5, test_years=1):
+    """
+    Walk-forward optimisation of the thresholds of determine_quadrant, the gold/bonds offset and the lookback:
+    on each fold the candidate with the best compounded in-sample return is chosen, then scored on the next years.
+    Everything runs in the current process: the yearly returns and the ratios are computed once in batches and the
+    whole candidate grid is scored in one vectorised pass (a process pool would cost more than the whole run to start).
+    Return (folds DataFrame, candidates DataFrame with the return of each candidate for each year).
+    """
+
+    years = [int(y) for y in years]
+    if train_years < 1 or test_years < 1:
+        raise ValueError("train_years and test_years must be >= 1")
+    folds = walk_forward_folds(years, train_years, test_years)
+    if not folds:
+        raise ValueError("Not enough years for one in-sample and one out-of-sample window")
+
+    candidates = build_candidates(bonds_threshold_grid, equity_threshold_grid, gold_bonds_offset_grid, lookback_years_grid)
+
+    # Shared computations (done once)
+    yearly_returns = get_yearly_returns(years, rebalance_days)
+    ratios = get_lookback_ratios(years, lookback_years_grid, gold_bonds_offset_grid)
+
+    # Return of each candidate for each year
+    returns = score_candidates(candidates, ratios, yearly_returns)
+
+    # Choose the best candidate of each fold (a candidate with a missing year in sample is not eligible)
+    fold_rows = []
+    for fold_id, (train, test) in enumerate(folds):
+        in_sample = np.prod(1 + returns[:, train], axis=1) - 1
+        if np.isnan(in_sample).all():
+            best, out_of_sample = None, np.nan
+        else:
+            best = int(np.nanargmax(in_sample))
+            out_of_sample = float(np.prod(1 + returns[best, test]) - 1)
+
+        fold_rows.append({
+            "fold": fold_id,
+            "train_first_year": years[train[0]],
+            "train_last_year": years[train[-1]],
+            "test_first_year": years[test[0]],
+            "test_last_year": years[test[-1]],
+            **({key: value for key, value in candidates[best].items()} if best is not None else {"candidate_id": None}),
+            "in_sample_return": float(in_sample[best]) if best is not None else np.nan,
+            "out_of_sample_return": out_of_sample,
+        })
+
+    folds_table = pd.DataFrame(fold_rows)
+    candidates_table = pd.DataFrame(candidates).join(pd.DataFrame(returns, columns=years))
+
+    return folds_table, candidates_table
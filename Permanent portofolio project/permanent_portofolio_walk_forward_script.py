@@ -0,0 +1,29 @@
+import os
+import time
+import permanent_portofolio_walk_forward_librairies as walk_forward
+
+# The tables are written next to this script whatever the working directory
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+
+    # Grids of the thresholds of determine_quadrant, of the gold/bonds offset and of the lookback
+    bonds_threshold_grid = [-0.05, 0, 0.05]
+    equity_threshold_grid = [0, 0.5, 1, 5]
+    gold_bonds_offset_grid = [0, 0.05, 0.1]
+    lookback_years_grid = [3, 5, 7]
+
+    # 5 years in sample, 1 year out of sample
+    start_time = time.perf_counter()
+    folds, candidates = walk_forward.run_walk_forward(list(range(2008, 2025)), 30, bonds_threshold_grid,
+                                                      equity_threshold_grid, gold_bonds_offset_grid, lookback_years_grid,
+                                                      train_years=5, test_years=1)
+    print(f"{len(candidates)} candidates in {time.perf_counter() - start_time:.2f} s")
+    print(folds)
+
+    # Out-of-sample money of the walk-forward
+    print(f"Out-of-sample performance: {((1 + folds['out_of_sample_return']).prod() - 1) * 100:.2f}%")
+
+    # Save the tables
+    folds.to_csv(os.path.join(OUTPUT_DIR, "permanent_portofolio_walk_forward_folds.csv"), index=False)
+    candidates.to_csv(os.path.join(OUTPUT_DIR, "permanent_portofolio_walk_forward_candidates.csv"), index=False)
@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import data_download_script as data_dl
+import permanent_portofolio_simulations_librairies as lib
+
+
+class QuadrantCache:
+    """
+    Cache of the classified windows: key = (dataset fingerprint, ratio window, threshold parameters),
+    value = (gold_bonds_ratio, gold_equity_ratio, quadrant).
+    In memory with a bounded LRU eviction, and optionally on disk (SQLite file) to keep the results between runs.
+    The fingerprint changes when the price store is refreshed, so the old entries are never used again.
+    """
+
+    def __init__(self, max_size=4096, disk_path=None):
+        self.max_size = max_size
+        self.disk_path = disk_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pruned_fingerprints = set()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_path is not None:
+            self._connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS quadrants ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT, gold_bonds_ratio REAL, gold_equity_ratio REAL, quadrant TEXT)"
+            )
+            self._connection.commit()
+
+    def _prune_disk(self, fingerprint):
+        # Entries of older datasets are useless: remove them the first time a fingerprint is seen
+        if self._connection is None or fingerprint in self._pruned_fingerprints:
+            return
+        self._connection.execute("DELETE FROM quadrants WHERE fingerprint != ?", (fingerprint,))
+        self._connection.commit()
+        self._pruned_fingerprints.add(fingerprint)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            if self._connection is not None:
+                self._prune_disk(key[0])
+                row = self._connection.execute(
+                    "SELECT gold_bonds_ratio, gold_equity_ratio, quadrant FROM quadrants WHERE key = ?", (repr(key),)
+                ).fetchone()
+                if row is not None:
+                    self._put_memory(key, row)
+                    self.hits += 1
+                    return row
+
+            self.misses += 1
+            return None
+
+    def _put_memory(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def put(self, key, value):
+        with self._lock:
+            self._put_memory(key, value)
+            if self._connection is not None:
+                self._prune_disk(key[0])
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO quadrants VALUES (?, ?, ?, ?, ?)", (repr(key), key[0], *value)
+                )
+                self._connection.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM quadrants")
+                self._connection.commit()
+
+
+# Cache used by default (in memory only, see configure_quadrant_cache)
+_QUADRANT_CACHE = QuadrantCache()
+
+
+def configure_quadrant_cache(max_size=4096, disk_path=None):
+    """
+    Replace the default cache (ex: add a disk tier with disk_path="quadrant_cache.sqlite").
+    """
+    global _QUADRANT_CACHE
+    _QUADRANT_CACHE = QuadrantCache(max_size, disk_path)
+    return _QUADRANT_CACHE
+
+
+def get_quadrant_cache():
+    return _QUADRANT_CACHE
+
+
+def _window_key(fingerprint, start_date, end_date, bonds_threshold, equity_threshold, gold_bonds_offset):
+    return (fingerprint, pd.Timestamp(start_date).strftime("%Y-%m-%d"), pd.Timestamp(end_date).strftime("%Y-%m-%d"),
+            float(bonds_threshold), float(equity_threshold), float(gold_bonds_offset))
+
+
+def classify_window(start_date, end_date, bonds_threshold=0, equity_threshold=5, gold_bonds_offset=0.05):
+    """
+    Ratios and quadrant of one window (same as lib.get_market_ratios + lib.determine_quadrant), from the cache when possible.
+    """
+
+    key = _window_key(data_dl.get_data_fingerprint(), start_date, end_date, bonds_threshold, equity_threshold, gold_bonds_offset)
+    cached = _QUADRANT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    gold_bonds_ratio, gold_equity_ratio = lib.get_market_ratios(start_date, end_date, gold_bonds_offset)
+    quadrant = lib.determine_quadrant(gold_bonds_ratio, gold_equity_ratio, bonds_threshold, equity_threshold)
+    value = (gold_bonds_ratio, gold_equity_ratio, quadrant)
+    _QUADRANT_CACHE.put(key, value)
+
+    return value
+
+
+def classify_windows(start_dates, end_dates, bonds_threshold=0, equity_threshold=5, gold_bonds_offset=0.05):
+    """
+    Ratios and quadrants of many windows: the windows missing from the cache are computed in one batch.
+    Windows without data give NaN ratios and None as quadrant (they are not cached).
+    """
+
+    fingerprint = data_dl.get_data_fingerprint()
+    keys = [_window_key(fingerprint, start, end, bonds_threshold, equity_threshold, gold_bonds_offset)
+            for start, end in zip(start_dates, end_dates)]
+
+    gold_bonds_ratio = np.full(len(keys), np.nan)
+    gold_equity_ratio = np.full(len(keys), np.nan)
+    quadrants = np.full(len(keys), None, dtype=object)
+
+    # Read the cache
+    missing = []
+    for i, key in enumerate(keys):
+        cached = _QUADRANT_CACHE.get(key)
+        if cached is None:
+            missing.append(i)
+        else:
+            gold_bonds_ratio[i], gold_equity_ratio[i], quadrants[i] = cached
+
+    # Compute the missing windows in one call
+    if missing:
+        missing = np.array(missing)
+        batch_gb, batch_ge = lib.get_market_ratios_batch([keys[i][1] for i in missing], [keys[i][2] for i in missing], gold_bonds_offset)
+        batch_quadrants = lib.determine_quadrant_batch(batch_gb, batch_ge, bonds_threshold, equity_threshold)
+        for j, i in enumerate(missing):
+            if np.isnan(batch_gb[j]) or np.isnan(batch_ge[j]):
+                continue
+            gold_bonds_ratio[i], gold_equity_ratio[i], quadrants[i] = batch_gb[j], batch_ge[j], batch_quadrants[j]
+            _QUADRANT_CACHE.put(keys[i], (float(batch_gb[j]), float(batch_ge[j]), str(batch_quadrants[j])))
+
+    return gold_bonds_ratio, gold_equity_ratio, quadrants
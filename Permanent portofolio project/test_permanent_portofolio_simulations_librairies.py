@@ -0,0 +1,77 @@
+import contextlib
+import io
+import pytest
+import data_download_script as data_dl
+import permanent_portofolio_benchmark_librairies as bench
+import permanent_portofolio_simulations_librairies as lib
+
+QUADRANT_1 = "Quadrant 1: Inflationary Bust"
+QUADRANT_2 = "Quadrant 2: Inflationary Boom"
+QUADRANT_3 = "Quadrant 3: Deflationary Bust"
+QUADRANT_4 = "Quadrant 4: Deflationary Boom"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def synthetic_data():
+    """
+    Synthetic prices (1990-1995, seed 0) used instead of the store, nothing is downloaded or written.
+    """
+    data_dl.set_data_download_global(bench.generate_synthetic_panel(6, seed=0))
+    yield
+    data_dl.reset_data_download_global()
+
+
+def run(rebalance_days, economic_quadrant, year):
+    # Margin calls are printed by get_return_of_investments: count them
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        final_money, performance_percentage, _ = lib.get_return_of_investments(
+            1000, rebalance_days, economic_quadrant, f"{year}-01-01", f"{year + 1}-01-01")
+    return final_money, performance_percentage, output.getvalue().count("appel_de_marge_6")
+
+
+# final_money of the original day-by-day code (average yield of the sub-period compounded daily)
+@pytest.mark.parametrize("economic_quadrant, year, rebalance_days, expected", [
+    (QUADRANT_3, 1992, 1, 1042.236574502449),
+    (QUADRANT_3, 1992, 30, 1042.236773272602),
+    (QUADRANT_3, 1992, 100, 1042.236871285208),
+    (QUADRANT_3, 1995, 100, 1043.99250767369),
+    (QUADRANT_4, 1993, 30, 975.275401206815),
+    (QUADRANT_4, 1995, 100, 1023.7907881476667),
+])
+def test_bond_carry_matches_the_original_compounding(economic_quadrant, year, rebalance_days, expected):
+    final_money, performance_percentage, _ = run(rebalance_days, economic_quadrant, year)
+    assert final_money == pytest.approx(expected, rel=1e-12)
+    assert performance_percentage == pytest.approx((expected / 1000 - 1) * 100, rel=1e-9)
+
+
+# final_money, performance_percentage and margin calls of the original per-period loop of get_return_of_investments
+@pytest.mark.parametrize("economic_quadrant, year, rebalance_days, expected", [
+    (QUADRANT_1, 1992, 1, (991.3824261661042, -0.8617573833895831, 0)),
+    (QUADRANT_1, 1993, 30, (746.8960886754828, -25.310391132451716, 0)),
+    (QUADRANT_1, 1995, 100, (1318.7147730661095, 31.871477306610952, 0)),
+    (QUADRANT_2, 1992, 1, (984.4026145423984, -1.5597385457601587, 0)),
+    (QUADRANT_2, 1992, 30, (982.0808180050806, -1.7919181994919375, 0)),
+    (QUADRANT_2, 1993, 100, (824.7620904367642, -17.52379095632358, 1)),
+    (QUADRANT_2, 1995, 30, (1154.8059027125123, 15.480590271251238, 0)),
+    (QUADRANT_2, 1995, 100, (1161.4001178351655, 16.140011783516538, 0)),
+    (QUADRANT_4, 1992, 1, (1005.8735447879097, 0.587354478790969, 0)),
+])
+def test_return_of_investments_matches_the_original_loop(economic_quadrant, year, rebalance_days, expected):
+    final_money, performance_percentage, margin_calls = run(rebalance_days, economic_quadrant, year)
+    assert final_money == pytest.approx(expected[0], rel=1e-12)
+    assert performance_percentage == pytest.approx(expected[1], rel=1e-9)
+    assert margin_calls == expected[2]
+
+
+def test_margin_calls_are_counted_without_printing():
+    # Same margin-call path as above (one sub-period of 1993 where an asset loses more than 16.666%)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        final_money, _, _ = lib.get_return_of_investments(1000, 100, QUADRANT_2, "1993-01-01", "1994-01-01", verbose=False)
+        strategies_money, _, margin_calls = lib.get_return_of_strategies(1000, 100, QUADRANT_2, "1993-01-01", "1994-01-01")
+
+    assert output.getvalue() == ""
+    assert final_money == pytest.approx(824.7620904367642, rel=1e-12)
+    assert list(margin_calls) == [1]
+    assert float(strategies_money[0]) == final_money
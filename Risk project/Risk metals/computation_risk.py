@@ -1,9 +1,9 @@
-import pickle
 import pandas as pd
 import matplotlib.pyplot as plt
+import data_download_script_metals as data_dl
 
-data_gold = pickle.load(open("data_download_gold.pkl", "rb"))
-price = data_gold["GC=F"].dropna()
+# Read only the gold column of the store
+price = data_dl.get_data(["GC=F"])["GC=F"].dropna()
 running_max = price.cummax()
 drawdown = price / running_max - 1
 
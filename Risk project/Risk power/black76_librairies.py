@@ -0,0 +1,186 @@
+import numpy as np
+from scipy.stats import norm
+
+# =========================
+# Black-76 sur des tableaux
+# =========================
+# F, K, T, r, sigma et option_type peuvent être des scalaires ou des tableaux numpy (broadcast entre eux).
+# option_type : "call" / "put" (ou un tableau de ces chaînes), ou un booléen / tableau de booléens (True = call).
+
+
+def is_call(option_type):
+    """
+    Tableau de booléens (True = call) à partir des types d'option.
+    """
+    option_type = np.asarray(option_type)
+    if option_type.dtype == bool:
+        return option_type
+
+    calls = option_type == "call"
+    if not np.all(calls | (option_type == "put")):
+        raise ValueError("option_type doit être 'call' ou 'put'")
+    return calls
+
+
+def _black76_terms(F, K, T, r, sigma, option_type):
+    """
+    Termes communs à tous les résultats : signe (+1 call, -1 put), actualisation, d1, d2, N(signe * d1), N(signe * d2),
+    n(d1). À l'échéance (ou avec sigma = 0) d1/d2 ne sont pas définis : la valeur intrinsèque est utilisée.
+    """
+
+    F, K, T, r, sigma = (np.asarray(x, dtype=float) for x in (F, K, T, r, sigma))
+    sign = np.where(is_call(option_type), 1.0, -1.0)
+
+    sqrt_T = np.sqrt(np.maximum(T, 0.0))
+    discount = np.exp(-r * T)
+    sigma_sqrt_T = sigma * sqrt_T
+    alive = sigma_sqrt_T > 0
+
+    # d1 / d2 (valeurs sans objet quand l'option n'a plus de valeur temps)
+    safe_sigma_sqrt_T = np.where(alive, sigma_sqrt_T, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(F / K) + 0.5 * sigma_sqrt_T ** 2) / safe_sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+
+    # Une seule évaluation de cdf par d (le put utilise -d) et de pdf (K n(d2) = F n(d1))
+    cdf_d1 = np.where(alive, norm.cdf(sign * d1), (sign * (F - K) > 0).astype(float))
+    cdf_d2 = np.where(alive, norm.cdf(sign * d2), (sign * (F - K) > 0).astype(float))
+    pdf_d1 = np.where(alive, norm.pdf(d1), 0.0)
+
+    return F, K, T, r, sigma, sign, sqrt_T, discount, safe_sigma_sqrt_T, d1, d2, cdf_d1, cdf_d2, pdf_d1
+
+
+def black76_price(F, K, T, r, sigma, option_type="call"):
+    """
+    Prix Black-76 (call et put) sur des tableaux.
+    """
+    F, K, T, r, sigma, sign, sqrt_T, discount, _, _, _, cdf_d1, cdf_d2, _ = _black76_terms(F, K, T, r, sigma, option_type)
+    return discount * sign * (F * cdf_d1 - K * cdf_d2)
+
+
+def black76(F, K, T, r, sigma, option_type="call"):
+    """
+    Prix et Greeks Black-76 en une passe (d1, d2, pdf et cdf calculés une seule fois) :
+    - delta : dérivée du prix par rapport au future F,
+    - gamma : dérivée seconde par rapport à F,
+    - vega : dérivée par rapport à sigma (pour +1 = +100 points de vol),
+    - theta : variation du prix quand le temps passe (par an, -dPrix/dT),
+    - rho : dérivée par rapport au taux r (F fixé).
+    Retourne un dict de tableaux.
+    """
+
+    F, K, T, r, sigma, sign, sqrt_T, discount, safe_sigma_sqrt_T, _, _, cdf_d1, cdf_d2, pdf_d1 = _black76_terms(
+        F, K, T, r, sigma, option_type)
+
+    price = discount * sign * (F * cdf_d1 - K * cdf_d2)
+    delta = sign * discount * cdf_d1
+    gamma = discount * pdf_d1 / (F * safe_sigma_sqrt_T)
+    vega = discount * F * pdf_d1 * sqrt_T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        time_decay = np.where(sqrt_T > 0, discount * F * pdf_d1 * sigma / (2 * np.where(sqrt_T > 0, sqrt_T, 1.0)), 0.0)
+    theta = -time_decay + r * price
+    rho = -T * price
+
+    return {
+        "price": price,
+        "delta": delta,
+        "gamma": gamma,
+        "vega": vega,
+        "theta": theta,
+        "rho": rho,
+    }
+
+
+# =========================
+# Vol implicite sur des tableaux
+# =========================
+
+def _initial_vol_guess(price, F, K, T, discount, calls):
+    """
+    Approximation rationnelle de la vol (Corrado-Miller, sur le prix du call non actualisé par parité call-put).
+    """
+    call_price = price / discount + np.where(calls, 0.0, F - K)
+    half_moneyness = (F - K) / 2
+    centred = call_price - half_moneyness
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = np.sqrt(np.maximum(centred ** 2 - (F - K) ** 2 / np.pi, 0.0))
+        return np.sqrt(2 * np.pi) / (F + K) * (centred + root) / np.sqrt(T)
+
+
+def implied_vol_black76(price, F, K, T, r, option_type="call", sigma_min=0.0001, sigma_max=5.0, tol=1e-12, max_iter=100):
+    """
+    Vol implicite Black-76 de tableaux de prix (toutes les options en même temps) : Halley (Newton avec la dérivée
+    seconde) à partir d'une approximation rationnelle, protégé par un encadrement [sigma_min, sigma_max] réduit à chaque
+    itération (bissection quand le pas sort de l'encadrement).
+    NaN quand le prix est hors des bornes de non-arbitrage ou quand la vol est hors de [sigma_min, sigma_max]
+    (comme brentq sur [0.0001, 5.0]), ou quand max_iter itérations ne suffisent pas.
+    Retourne (vols, nombre d'itérations de chaque élément).
+    """
+
+    price, F, K, T, r, calls = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, F, K, T, r)),
+                                                   is_call(option_type))
+    shape = price.shape
+    price, F, K, T, r, calls = (x.ravel() for x in (price, F, K, T, r, calls))
+    option_types = np.where(calls, "call", "put")
+    discount = np.exp(-r * T)
+
+    vols = np.full(price.shape, np.nan)
+    iterations = np.zeros(price.shape, dtype=np.int64)
+
+    # Bornes : le prix doit être entre les prix avec sigma_min et sigma_max (donc aussi entre la valeur intrinsèque
+    # actualisée et F ou K actualisé)
+    low_price = black76_price(F, K, T, r, sigma_min, option_types)
+    high_price = black76_price(F, K, T, r, sigma_max, option_types)
+    solvable = (T > 0) & (price >= low_price) & (price <= high_price)
+
+    # Prix égal à une borne (ex : option très en dehors de la monnaie, prix nul) : la borne, comme brentq
+    at_low = solvable & (price == low_price)
+    at_high = solvable & ~at_low & (price == high_price)
+    vols[at_low] = sigma_min
+    vols[at_high] = sigma_max
+
+    # Éléments encore à résoudre et leur encadrement
+    active = np.flatnonzero(solvable & ~at_low & ~at_high)
+    low = np.full(active.shape, sigma_min)
+    high = np.full(active.shape, sigma_max)
+    previous_width = np.full(active.shape, np.inf)
+    sigma = np.clip(np.nan_to_num(_initial_vol_guess(price[active], F[active], K[active], T[active], discount[active],
+                                                     calls[active]), nan=0.5), sigma_min, sigma_max)
+
+    for iteration in range(max_iter):
+        if len(active) == 0:
+            break
+        iterations[active] += 1
+
+        # Prix, vega et volga avec les mêmes d1 / d2
+        terms = _black76_terms(F[active], K[active], T[active], r[active], sigma, option_types[active])
+        _, _, _, _, _, sign, sqrt_T, disc, _, d1, d2, cdf_d1, cdf_d2, pdf_d1 = terms
+        error = disc * sign * (F[active] * cdf_d1 - K[active] * cdf_d2) - price[active]
+        vega = disc * F[active] * pdf_d1 * sqrt_T
+        volga = vega * d1 * d2 / sigma
+
+        # L'encadrement se réduit : le prix croît avec sigma
+        previous_width, two_steps_width = high - low, previous_width
+        high = np.where(error > 0, sigma, high)
+        low = np.where(error <= 0, sigma, low)
+
+        # Pas de Halley, bissection quand il sort de l'encadrement (ou vega trop petit)
+        # ou, après les premières itérations, quand les deux derniers pas n'ont pas divisé l'encadrement par deux
+        # (convergence trop lente, ex : prix presque nul)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = error / vega
+            halley = newton / (1 - 0.5 * newton * volga / vega)
+            new_sigma = sigma - halley
+        inside = np.isfinite(new_sigma) & (new_sigma > low) & (new_sigma < high) & (
+            (iteration < 4) | (high - low <= 0.5 * two_steps_width))
+        new_sigma = np.where(inside, new_sigma, 0.5 * (low + high))
+
+        # Convergence sur la vol (le prix seul ne suffit pas quand vega est très petit)
+        converged = (error == 0) | (np.abs(new_sigma - sigma) <= tol) | (high - low <= tol)
+        vols[active[converged]] = np.where(error[converged] == 0, sigma[converged], new_sigma[converged])
+
+        keep = ~converged
+        active, sigma, low, high = active[keep], new_sigma[keep], low[keep], high[keep]
+        previous_width = previous_width[keep]
+
+    return vols.reshape(shape), iterations.reshape(shape)
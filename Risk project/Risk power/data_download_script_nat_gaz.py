@@ -1,9 +1,52 @@
+import os
+import sys
+from datetime import date
+
+# Shared librairies (price store) are in the folder "Shared librairies" at the root of the repository
+SHARED_LIBRAIRIES = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Shared librairies"))
+if SHARED_LIBRAIRIES not in sys.path:
+    sys.path.append(SHARED_LIBRAIRIES)
+import price_store_librairies as price_store
 import data_download_librairies_nat_gaz as data_lib
-import pickle
 
-CACHE_PATH = "data_download_nat_gaz.pkl"  # the file used as cache
+# The folder used as cache (one file per ticker + date index), next to this script whatever the working directory
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_download_nat_gaz_store")
+
+
+def get_data_download_global():
+    """
+    Data of the store, loaded on the first call only (importing this module does not read anything).
+    """
+    return price_store.get_dataset(STORE_PATH)
+
+
+def get_data(tickers, start_date=None, end_date=None):
+    """
+    Only the requested tickers and dates of the store (the data already loaded in memory is used when there is one).
+    """
+    return price_store.get_columns(STORE_PATH, tickers, start_date, end_date)
+
 
-if __name__ == "__main__":
+def get_data_fingerprint():
+    """
+    Fingerprint of the loaded data (changes when the store is refreshed), used as key by the caches.
+    """
+    return price_store.get_dataset_fingerprint(STORE_PATH)
+
+
+def __getattr__(name):
+    # Keep "data_dl.data_download_global" working: the store is loaded on the first access
+    if name == "data_download_global":
+        return get_data_download_global()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if __name__ == "__main__" and "--refresh" in sys.argv:
+
+    # Refresh mode: only download the dates after the last stored date of each ticker and append them to the store
+    nb_new_dates = price_store.refresh_price_store(STORE_PATH, data_lib.download_all_data, date.today().isoformat(), start_date="2022-01-01")
+    print("Store refreshed:", STORE_PATH, "| new dates:", nb_new_dates)
+
+elif __name__ == "__main__":
 
     # Download the data and store it in memory (take more large than the simulations date at least 1 month before and 1 month after)
     data_download_global = data_lib.download_all_data("2022-01-01", "2026-01-01")
@@ -11,15 +54,9 @@ if __name__ == "__main__":
     # Check if the datas are empty
     if not data_download_global.empty:
 
-        # Save the variable into the cache
-        with open(CACHE_PATH, "wb") as f:   # wb = write binary
-            pickle.dump(data_download_global, f)
-        print("Cache created:", CACHE_PATH)
+        # Save the variable into the store
+        price_store.write_price_store(data_download_global, STORE_PATH)
+        print("Store created:", STORE_PATH)
 
     else:
         print('Error during the download')
-
-# Load the variable back from the cache
-with open(CACHE_PATH, "rb") as f:       # rb = read binary
-    data_download_global = pickle.load(f)
-#print("Cache loaded into memory and type is :", type(data_download_global))
\ No newline at end of file
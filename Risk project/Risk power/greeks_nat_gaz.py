@@ -1,15 +1,15 @@
-import pickle
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.stats import norm
-from scipy.optimize import brentq
+import data_download_script_nat_gaz as data_dl
+import black76_librairies as b76
 
 # =========================
 # Load data
 # =========================
 
-data_nat_gaz = pickle.load(open("data_download_nat_gaz.pkl", "rb"))
+# Read only the NG=F column of the store
+data_nat_gaz = data_dl.get_data(["NG=F"])
 
 df_option = pd.DataFrame()
 df_option["future_price_M_1"] = data_nat_gaz["NG=F"].dropna().astype(float)
@@ -32,47 +32,6 @@ quantity = 1
 # Pour l'instant 1 pour simplifier
 contract_size = 1
 
-# =========================
-# Fonctions Black-76
-# =========================
-
-def black76_call(F, K, T, r, sigma):
-    sqrt_T = np.sqrt(T)
-    discount = np.exp(-r * T)
-
-    d1 = (np.log(F / K) + 0.5 * sigma**2 * T) / (sigma * sqrt_T)
-    d2 = d1 - sigma * sqrt_T
-
-    price = discount * (F * norm.cdf(d1) - K * norm.cdf(d2))
-    return price
-
-
-def black76_put(F, K, T, r, sigma):
-    sqrt_T = np.sqrt(T)
-    discount = np.exp(-r * T)
-
-    d1 = (np.log(F / K) + 0.5 * sigma**2 * T) / (sigma * sqrt_T)
-    d2 = d1 - sigma * sqrt_T
-
-    price = discount * (K * norm.cdf(-d2) - F * norm.cdf(-d1))
-    return price
-
-
-def implied_vol_black76(market_price, F, K, T, r, option_type="call"):
-    def objective(sigma):
-        if option_type == "call":
-            return black76_call(F, K, T, r, sigma) - market_price
-        elif option_type == "put":
-            return black76_put(F, K, T, r, sigma) - market_price
-        else:
-            raise ValueError("option_type doit être 'call' ou 'put'")
-
-    try:
-        implied_vol = brentq(objective, 0.0001, 5.0)
-        return implied_vol
-    except ValueError:
-        return np.nan
-
 # =========================
 # 1) Simuler une fausse volatilité implicite
 # =========================
@@ -89,38 +48,29 @@ df_option["sigma_implied_fake"] = np.random.uniform(
 # 2) Calculer un faux prix de marché d'option
 # =========================
 
-if option_type == "call":
-    df_option["option_price_market_fake"] = [
-        black76_call(F, K, T, r, sigma)
-        for F, sigma in zip(
-            df_option["future_price_M_1"],
-            df_option["sigma_implied_fake"]
-        )
-    ]
-
-elif option_type == "put":
-    df_option["option_price_market_fake"] = [
-        black76_put(F, K, T, r, sigma)
-        for F, sigma in zip(
-            df_option["future_price_M_1"],
-            df_option["sigma_implied_fake"]
-        )
-    ]
-
-else:
-    raise ValueError("option_type doit être 'call' ou 'put'")
+# Tous les prix en une fois (tableaux)
+df_option["option_price_market_fake"] = b76.black76_price(
+    df_option["future_price_M_1"].to_numpy(),
+    K,
+    T,
+    r,
+    df_option["sigma_implied_fake"].to_numpy(),
+    option_type
+)
 
 # =========================
 # 3) Retrouver la vol implicite depuis le prix d'option
 # =========================
 
-df_option["sigma_implied_retrieved"] = [
-    implied_vol_black76(price, F, K, T, r, option_type)
-    for price, F in zip(
-        df_option["option_price_market_fake"],
-        df_option["future_price_M_1"]
-    )
-]
+# Toutes les vols en une fois (Halley protégé par un encadrement), NaN hors des bornes de non-arbitrage
+df_option["sigma_implied_retrieved"], df_option["implied_vol_iterations"] = b76.implied_vol_black76(
+    df_option["option_price_market_fake"].to_numpy(),
+    df_option["future_price_M_1"].to_numpy(),
+    K,
+    T,
+    r,
+    option_type
+)
 
 # =========================
 # 4) Comparaison sigma fake vs sigma retrouvée
@@ -137,88 +87,29 @@ df_option["difference_sigma"] = (
 
 df_option["sigma_used"] = df_option["sigma_implied_retrieved"]
 
-df_option["sqrt_T"] = np.sqrt(T)
-df_option["discount"] = np.exp(-r * T)
-
-df_option["d1"] = (
-    np.log(df_option["future_price_M_1"] / K)
-    + 0.5 * df_option["sigma_used"]**2 * T
-) / (
-    df_option["sigma_used"] * df_option["sqrt_T"]
-)
-
-df_option["d2"] = (
-    df_option["d1"]
-    - df_option["sigma_used"] * df_option["sqrt_T"]
-)
-
-# =========================
-# Delta
-# =========================
-
-if option_type == "call":
-    df_option["delta"] = (
-        df_option["discount"]
-        * norm.cdf(df_option["d1"])
-    )
-
-elif option_type == "put":
-    df_option["delta"] = (
-        -df_option["discount"]
-        * norm.cdf(-df_option["d1"])
-    )
-
-# =========================
-# Gamma
-# =========================
-
-df_option["gamma"] = (
-    df_option["discount"]
-    * norm.pdf(df_option["d1"])
-    / (
-        df_option["future_price_M_1"]
-        * df_option["sigma_used"]
-        * df_option["sqrt_T"]
-    )
+# Prix et Greeks de toutes les dates en une passe (d1, d2, pdf et cdf partagés)
+greeks = b76.black76(
+    df_option["future_price_M_1"].to_numpy(),
+    K,
+    T,
+    r,
+    df_option["sigma_used"].to_numpy(),
+    option_type
 )
 
-# =========================
-# Vega
-# =========================
-
-df_option["vega"] = (
-    df_option["discount"]
-    * df_option["future_price_M_1"]
-    * norm.pdf(df_option["d1"])
-    * df_option["sqrt_T"]
-)
+df_option["delta"] = greeks["delta"]
+df_option["gamma"] = greeks["gamma"]
+df_option["vega"] = greeks["vega"]
+df_option["theta"] = greeks["theta"]
+df_option["rho"] = greeks["rho"]
 
 # Vega pour +1 point de volatilité
 # Exemple : 80% -> 81%
 df_option["vega_1pct"] = df_option["vega"] * 0.01
 
-# =========================
-# Theta
-# =========================
-
-df_option["theta"] = (
-    -df_option["discount"]
-    * df_option["future_price_M_1"]
-    * norm.pdf(df_option["d1"])
-    * df_option["sigma_used"]
-    / (2 * df_option["sqrt_T"])
-    + r * df_option["option_price_market_fake"]
-)
-
 # Theta par jour
 df_option["theta_1day"] = df_option["theta"] / 365
 
-# =========================
-# Rho
-# =========================
-
-df_option["rho"] = -T * df_option["option_price_market_fake"]
-
 # Rho pour +1 bp de taux
 # Exemple : 4.00% -> 4.01%
 df_option["rho_1bp"] = df_option["rho"] * 0.0001
@@ -0,0 +1,55 @@
+import os
+import data_download_script_nat_gaz as data_dl
+import vol_surface_librairies as vol_surface
+import options_book_librairies as book
+
+# =========================
+# Marché et positions du gaz naturel (partagés par les scripts de risque)
+# =========================
+
+# Fichiers locaux (remplacent le flux de marché et le système de positions), à côté de ce fichier quel que soit le
+# répertoire courant. Ils ne sont pas versionnés : sans fichier, de fausses données sont générées à chaque exécution
+QUOTES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "option_quotes_nat_gaz.csv")
+POSITIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "positions_nat_gaz.csv")
+
+UNDERLYING = "NG=F"
+
+
+def load_market(r=0.04, with_positions=False, nb_positions=5000):
+    """
+    Date de valorisation (dernière date de NG=F dans le store), dernier prix du future M-1, nappe de vol construite sur
+    les cotations de QUOTES_PATH et, si with_positions, positions de POSITIONS_PATH.
+    Sans fichier de cotations, de fausses cotations sont générées à la date de valorisation (rien n'est écrit, elles
+    suivent donc les rafraîchissements du store). Un fichier de cotations d'une autre date lève une ValueError.
+    De même, sans fichier de positions, les positions sont générées à chaque appel.
+    Retourne un dict : valuation_date, future_price, surfaces (sous-jacent -> VolSurface), positions (ou None).
+    """
+
+    # Seule la colonne NG=F est lue dans le store
+    future_prices = data_dl.get_data([UNDERLYING])[UNDERLYING].dropna()
+    valuation_date = future_prices.index[-1]
+    future_price = future_prices.iloc[-1]
+
+    if os.path.exists(QUOTES_PATH):
+        try:
+            surface = vol_surface.VolSurface(vol_surface.read_option_quotes(QUOTES_PATH), valuation_date, r)
+        except ValueError as e:
+            raise ValueError(f"{QUOTES_PATH} : {e}. Mettre à jour le fichier ou le supprimer (fausses cotations).") from e
+    else:
+        surface = vol_surface.VolSurface(vol_surface.generate_option_quotes(future_price, valuation_date, r),
+                                         valuation_date, r)
+
+    # Sans fichier de positions, faux book de nb_positions positions (graine fixe : le même pour un même marché)
+    positions = None
+    if with_positions:
+        if os.path.exists(POSITIONS_PATH):
+            positions = book.read_positions(POSITIONS_PATH)
+        else:
+            positions = book.generate_positions(nb_positions, {UNDERLYING: future_price}, surface.expiries)
+
+    return {
+        "valuation_date": valuation_date,
+        "future_price": future_price,
+        "surfaces": {UNDERLYING: surface},
+        "positions": positions,
+    }
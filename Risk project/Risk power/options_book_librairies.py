@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import black76_librairies as b76
+
+# =========================
+# Table des positions
+# =========================
+# Une ligne par position : instrument, book, underlying, strike, expiry, option_type, quantity, contract_size
+# quantity > 0 : acheteur de l'option, quantity < 0 : vendeur / émetteur
+
+POSITION_COLUMNS = ["instrument", "book", "underlying", "strike", "expiry", "option_type", "quantity", "contract_size"]
+
+# Colonnes d'exposition (sommées par les agrégations)
+EXPOSURE_COLUMNS = [
+    "option_position_value",
+    "delta_position",
+    "delta_exposure",
+    "gamma_position",
+    "gamma_exposure",
+    "vega_exposure_1pct",
+    "theta_position_1day",
+    "rho_position_1bp",
+]
+
+# Tranches d'échéance (bornes en années), les positions échues à la date de valorisation sont dans EXPIRED_BUCKET
+EXPIRY_BUCKETS = [0, 1 / 12, 3 / 12, 6 / 12, 1, np.inf]
+EXPIRY_BUCKET_LABELS = ["0-1M", "1-3M", "3-6M", "6-12M", "1Y+"]
+EXPIRED_BUCKET = "expired"
+
+
+def read_positions(path):
+    """
+    Lire un fichier CSV de positions (colonnes POSITION_COLUMNS).
+    """
+    positions = pd.read_csv(path, parse_dates=["expiry"])
+    missing = [col for col in POSITION_COLUMNS if col not in positions.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {path} : {missing}")
+    return positions[POSITION_COLUMNS]
+
+
+def write_positions(positions, path):
+    positions[POSITION_COLUMNS].to_csv(path, index=False, date_format="%Y-%m-%d")
+
+
+def generate_positions(nb_positions, underlying_prices, expiries, books=("trading", "hedge", "client"), seed=42):
+    """
+    Faux book d'options (strikes autour du prix de chaque sous-jacent, échéances et books au hasard).
+    underlying_prices : dict sous-jacent -> prix.
+    """
+
+    rng = np.random.default_rng(seed)
+    underlyings = np.array(list(underlying_prices))
+    underlying = underlyings[rng.integers(0, len(underlyings), nb_positions)]
+    prices = np.array([underlying_prices[u] for u in underlying])
+
+    return pd.DataFrame({
+        "instrument": [f"OPT{i:05d}" for i in range(nb_positions)],
+        "book": np.array(books)[rng.integers(0, len(books), nb_positions)],
+        "underlying": underlying,
+        "strike": np.round(prices * rng.uniform(0.7, 1.4, nb_positions), 2),
+        "expiry": pd.DatetimeIndex(expiries)[rng.integers(0, len(expiries), nb_positions)],
+        "option_type": np.where(rng.random(nb_positions) < 0.5, "call", "put"),
+        "quantity": rng.integers(-50, 51, nb_positions),
+        "contract_size": 10000,
+    })
+
+
+# =========================
+# Greeks par position
+# =========================
+
+def compute_position_greeks(positions, surfaces, valuation_date, r=0.04):
+    """
+    Prix, Greeks et expositions de toutes les positions en un appel Black-76.
+    surfaces : dict sous-jacent -> VolSurface (future et vol de chaque position lus dans la nappe).
+    Les positions échues (échéance <= date de valorisation) restent dans la table, dans la tranche EXPIRED_BUCKET,
+    avec des expositions nulles (future et vol NaN) : elles sont comptées par les agrégations et signalées.
+    Le taux r est gardé dans la colonne "r" : les revalorisations (scenario_librairies) utilisent le même taux que le prix.
+    """
+
+    greeks = positions.copy()
+    greeks["T"] = (pd.to_datetime(greeks["expiry"]) - pd.Timestamp(valuation_date)).dt.days / 365
+    greeks["r"] = float(r)
+    live = np.flatnonzero(greeks["T"].to_numpy() > 0)
+
+    expired = greeks["instrument"].to_numpy()[greeks["T"].to_numpy() <= 0]
+    if len(expired):
+        print(f"⚠️ {len(expired)} positions échues au {pd.Timestamp(valuation_date):%Y-%m-%d} (tranche {EXPIRED_BUCKET}, "
+              f"expositions nulles) : {', '.join(map(str, expired[:10]))}{' ...' if len(expired) > 10 else ''}")
+
+    # Future et vol de chaque position vivante (une lecture de nappe par sous-jacent)
+    F = np.full(len(greeks), np.nan)
+    sigma = np.full(len(greeks), np.nan)
+    for underlying, rows in greeks.iloc[live].groupby("underlying").indices.items():
+        if underlying not in surfaces:
+            raise KeyError(f"Pas de nappe de vol pour le sous-jacent {underlying}")
+        rows = live[rows]
+        surface = surfaces[underlying]
+        T = greeks["T"].to_numpy()[rows]
+        F[rows] = surface.forward(T)
+        sigma[rows] = surface.sigma(greeks["strike"].to_numpy()[rows], T, F[rows])
+
+    # Prix et Greeks nuls pour les positions échues
+    result = {name: np.zeros(len(greeks)) for name in ["price", "delta", "gamma", "vega", "theta", "rho"]}
+    live_result = b76.black76(F[live], greeks["strike"].to_numpy()[live], greeks["T"].to_numpy()[live], r, sigma[live],
+                              greeks["option_type"].to_numpy()[live])
+    for name, values in live_result.items():
+        result[name][live] = values
+    size = greeks["quantity"].to_numpy() * greeks["contract_size"].to_numpy()
+
+    greeks["future_price"] = F
+    greeks["sigma"] = sigma
+    for name, values in result.items():
+        greeks[name] = values
+    buckets = pd.cut(greeks["T"], EXPIRY_BUCKETS, labels=EXPIRY_BUCKET_LABELS, right=False)
+    greeks["expiry_bucket"] = buckets.cat.add_categories(EXPIRED_BUCKET).fillna(EXPIRED_BUCKET)
+
+    # Expositions (mêmes définitions que greeks_nat_gaz.py), F = 0 pour les positions échues
+    F = np.nan_to_num(F)
+    greeks["option_position_value"] = result["price"] * size
+    greeks["delta_position"] = result["delta"] * size
+    greeks["delta_exposure"] = result["delta"] * F * size
+    greeks["gamma_position"] = result["gamma"] * size
+    greeks["gamma_exposure"] = result["gamma"] * F ** 2 * size
+    greeks["vega_exposure_1pct"] = result["vega"] * 0.01 * size
+    greeks["theta_position_1day"] = result["theta"] / 365 * size
+    greeks["rho_position_1bp"] = result["rho"] * 0.0001 * size
+
+    return greeks
+
+
+# =========================
+# Agrégations
+# =========================
+
+def aggregate_greeks(greeks, by=("underlying", "expiry_bucket", "book")):
+    """
+    Somme des expositions par groupe (par défaut sous-jacent x tranche d'échéance x book), avec le nombre de positions.
+    """
+    by = list(by)
+    aggregated = greeks.groupby(by, observed=True)[EXPOSURE_COLUMNS].sum()
+    aggregated.insert(0, "nb_positions", greeks.groupby(by, observed=True).size())
+    return aggregated
+
+
+def greeks_summary(greeks):
+    """
+    Expositions agrégées à chaque niveau : par sous-jacent, par tranche d'échéance, par book et total.
+    """
+    return {
+        "underlying": aggregate_greeks(greeks, ["underlying"]),
+        "expiry_bucket": aggregate_greeks(greeks, ["underlying", "expiry_bucket"]),
+        "book": aggregate_greeks(greeks, ["book"]),
+        "total": greeks[EXPOSURE_COLUMNS].sum(),
+    }
@@ -0,0 +1,32 @@
+import time
+import market_librairies_nat_gaz as market
+import options_book_librairies as book
+
+# =========================
+# Marché et positions (fichiers locaux s'ils existent, sinon fausses données générées)
+# =========================
+
+r = 0.04
+
+market_nat_gaz = market.load_market(r, with_positions=True)
+valuation_date = market_nat_gaz["valuation_date"]
+surfaces = market_nat_gaz["surfaces"]
+positions = market_nat_gaz["positions"]
+
+# =========================
+# Greeks de toutes les positions et agrégations
+# =========================
+
+start_time = time.perf_counter()
+greeks = book.compute_position_greeks(positions, surfaces, valuation_date, r)
+summary = book.greeks_summary(greeks)
+print(f"{len(greeks)} positions en {time.perf_counter() - start_time:.3f} s")
+
+print("\nPar sous-jacent et tranche d'échéance :")
+print(summary["expiry_bucket"])
+
+print("\nPar book :")
+print(summary["book"])
+
+print("\nTotal :")
+print(summary["total"])
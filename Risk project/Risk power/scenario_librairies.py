@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import black76_librairies as b76
+
+# =========================
+# Grille de scénarios
+# =========================
+# price_shocks : chocs relatifs sur le future (ex : -0.2 = -20 %)
+# vol_shocks : chocs additifs sur la vol (ex : 0.05 = +5 points de vol)
+# time_shifts_days : jours écoulés (la maturité diminue, valeur intrinsèque à l'échéance)
+
+DEFAULT_PRICE_SHOCKS = np.round(np.arange(-0.3, 0.31, 0.05), 2) + 0.0  # + 0.0 : pas de -0.0
+DEFAULT_VOL_SHOCKS = np.array([-0.2, -0.1, -0.05, 0.0, 0.05, 0.1, 0.2])
+DEFAULT_TIME_SHIFTS_DAYS = np.array([0, 1, 7, 30])
+
+# Nombre de tableaux de la taille d'un bloc de scénarios en mémoire pendant la revalorisation (termes de Black-76)
+_ARRAYS_PER_CELL = 16
+
+
+def _chunk_size(nb_cells, memory_budget_mb):
+    # Nombre de positions par bloc pour rester dans le budget mémoire
+    return max(1, int(memory_budget_mb * 1024 ** 2 // (nb_cells * 8 * _ARRAYS_PER_CELL)))
+
+
+def revalue_scenarios(greeks, price_shocks=DEFAULT_PRICE_SHOCKS, vol_shocks=DEFAULT_VOL_SHOCKS,
+                      time_shifts_days=DEFAULT_TIME_SHIFTS_DAYS, by="underlying", memory_budget_mb=256,
+                      keep_positions=True):
+    """
+    Revalorisation complète (Black-76) de chaque position sur la grille chocs de prix x chocs de vol x temps.
+    greeks : table de options_book_librairies.compute_position_greeks (future_price, sigma, T, r, price, ...), les
+    positions sont revalorisées avec le taux r de leur prix de base (P&L nul sans choc).
+    Les positions sont traitées par blocs qui tiennent dans memory_budget_mb. Les positions échues ont un P&L nul.
+    Retourne un dict :
+    - "positions" : cube de P&L de chaque position (positions x prix x vol x temps), si keep_positions,
+    - "total" : cube de P&L du book (prix x vol x temps),
+    - "groups" / "by_group" : cubes de P&L par valeur de la colonne by (groupes x prix x vol x temps).
+    """
+
+    price_shocks = np.asarray(price_shocks, dtype=float)
+    vol_shocks = np.asarray(vol_shocks, dtype=float)
+    time_shifts = np.asarray(time_shifts_days, dtype=float) / 365
+    grid_shape = (len(price_shocks), len(vol_shocks), len(time_shifts))
+
+    F = greeks["future_price"].to_numpy()
+    K = greeks["strike"].to_numpy()
+    T = greeks["T"].to_numpy()
+    r = greeks["r"].to_numpy()
+    sigma = greeks["sigma"].to_numpy()
+    option_type = b76.is_call(greeks["option_type"].to_numpy())
+    base_price = greeks["price"].to_numpy()
+    size = (greeks["quantity"] * greeks["contract_size"]).to_numpy(dtype=float)
+    live = T > 0
+    group_codes, groups = pd.factorize(greeks[by])
+
+    positions_cube = np.empty((len(greeks),) + grid_shape) if keep_positions else None
+    groups_cube = np.zeros((len(groups),) + grid_shape)
+
+    # Axes : position, prix, vol, temps
+    price_factor = 1 + price_shocks[None, :, None, None]
+    shocked_vol = vol_shocks[None, None, :, None]
+    elapsed = time_shifts[None, None, None, :]
+
+    chunk = _chunk_size(int(np.prod(grid_shape)), memory_budget_mb)
+    for first in range(0, len(greeks), chunk):
+        rows = slice(first, first + chunk)
+        prices = b76.black76_price(
+            F[rows, None, None, None] * price_factor,
+            K[rows, None, None, None],
+            np.maximum(T[rows, None, None, None] - elapsed, 0.0),
+            r[rows, None, None, None],
+            np.maximum(sigma[rows, None, None, None] + shocked_vol, 0.0001),
+            option_type[rows, None, None, None],
+        )
+        pnl = np.where(live[rows, None, None, None], (prices - base_price[rows, None, None, None]) * size[rows, None, None, None], 0.0)
+
+        if keep_positions:
+            positions_cube[rows] = pnl
+        np.add.at(groups_cube, group_codes[rows], pnl)
+
+    return {
+        "price_shocks": price_shocks,
+        "vol_shocks": vol_shocks,
+        "time_shifts_days": np.asarray(time_shifts_days),
+        "positions": positions_cube,
+        "groups": list(groups),
+        "by_group": groups_cube,
+        "total": groups_cube.sum(axis=0),
+    }
+
+
+def pnl_ladder(scenarios, time_shift_days=0, group=None):
+    """
+    P&L en fonction des chocs de prix (lignes) et de vol (colonnes) pour un décalage de temps donné,
+    pour le book (group=None) ou pour un groupe.
+    """
+    t = list(scenarios["time_shifts_days"]).index(time_shift_days)
+    cube = scenarios["total"] if group is None else scenarios["by_group"][scenarios["groups"].index(group)]
+    return pd.DataFrame(cube[:, :, t], index=pd.Index(scenarios["price_shocks"], name="price_shock"),
+                        columns=pd.Index(scenarios["vol_shocks"], name="vol_shock"))
+
+
+def greek_ladders(greeks, price_shocks=DEFAULT_PRICE_SHOCKS, by="underlying", memory_budget_mb=256):
+    """
+    Échelles de delta, gamma et vega : expositions du book recalculées pour chaque choc de prix (vol et temps inchangés),
+    par valeur de la colonne by. Les positions sont traitées par blocs qui tiennent dans memory_budget_mb.
+    Les positions échues n'ont pas d'exposition. Le taux est celui de la colonne r (même taux que le prix de base).
+    """
+
+    price_shocks = np.asarray(price_shocks, dtype=float)
+    group_codes, groups = pd.factorize(greeks[by])
+
+    # Seules les positions vivantes sont revalorisées (les groupes des positions échues restent, à zéro)
+    live = greeks["T"].to_numpy() > 0
+    group_codes = group_codes[live]
+    greeks = greeks[live]
+    F = greeks["future_price"].to_numpy()
+    size = (greeks["quantity"] * greeks["contract_size"]).to_numpy(dtype=float)
+
+    ladders = {name: np.zeros((len(groups), len(price_shocks)))
+               for name in ["delta_exposure", "gamma_exposure", "vega_exposure_1pct"]}
+
+    chunk = _chunk_size(len(price_shocks), memory_budget_mb)
+    for first in range(0, len(greeks), chunk):
+        rows = slice(first, first + chunk)
+        shocked_F = F[rows, None] * (1 + price_shocks[None, :])
+        result = b76.black76(shocked_F, greeks["strike"].to_numpy()[rows, None], greeks["T"].to_numpy()[rows, None],
+                             greeks["r"].to_numpy()[rows, None], greeks["sigma"].to_numpy()[rows, None],
+                             greeks["option_type"].to_numpy()[rows, None])
+        position_size = size[rows, None]
+
+        np.add.at(ladders["delta_exposure"], group_codes[rows], result["delta"] * shocked_F * position_size)
+        np.add.at(ladders["gamma_exposure"], group_codes[rows], result["gamma"] * shocked_F ** 2 * position_size)
+        np.add.at(ladders["vega_exposure_1pct"], group_codes[rows], result["vega"] * 0.01 * position_size)
+
+    # Une ligne par groupe et choc de prix
+    index = pd.MultiIndex.from_product([list(groups), price_shocks], names=[by, "price_shock"])
+    return pd.DataFrame({name: values.ravel() for name, values in ladders.items()}, index=index)
@@ -0,0 +1,38 @@
+import time
+import market_librairies_nat_gaz as market
+import options_book_librairies as book
+import scenario_librairies as scenarios
+
+# =========================
+# Marché et positions (fichiers locaux s'ils existent, sinon fausses données générées)
+# =========================
+
+r = 0.04
+
+market_nat_gaz = market.load_market(r, with_positions=True)
+valuation_date = market_nat_gaz["valuation_date"]
+surfaces = market_nat_gaz["surfaces"]
+greeks = book.compute_position_greeks(market_nat_gaz["positions"], surfaces, valuation_date, r)
+
+# =========================
+# Revalorisation complète sur la grille prix x vol x temps
+# =========================
+
+start_time = time.perf_counter()
+results = scenarios.revalue_scenarios(greeks, by="book", memory_budget_mb=128)
+print(f"Cube de P&L {results['positions'].shape} en {time.perf_counter() - start_time:.3f} s")
+
+print("\nP&L du book (lignes : choc de prix, colonnes : choc de vol), aujourd'hui :")
+print(scenarios.pnl_ladder(results).round(0))
+
+print("\nP&L du book dans 30 jours :")
+print(scenarios.pnl_ladder(results, time_shift_days=30).round(0))
+
+# =========================
+# Échelles de gamma et vega
+# =========================
+
+start_time = time.perf_counter()
+ladders = scenarios.greek_ladders(greeks)
+print(f"\nÉchelles de Greeks en {time.perf_counter() - start_time:.3f} s")
+print(ladders)
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline
+import black76_librairies as b76
+
+# =========================
+# Cotations d'options (fichier local à la place d'un flux de marché)
+# =========================
+# Une ligne par option : quote_date (date des cotations), expiry (date), strike, option_type ("call" / "put"), price,
+# future_price (future de l'échéance)
+
+QUOTE_COLUMNS = ["quote_date", "expiry", "strike", "option_type", "price", "future_price"]
+
+
+def read_option_quotes(path):
+    """
+    Lire un fichier CSV de cotations (colonnes QUOTE_COLUMNS).
+    """
+    quotes = pd.read_csv(path, parse_dates=["quote_date", "expiry"])
+    missing = [col for col in QUOTE_COLUMNS if col not in quotes.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans {path} : {missing}")
+    return quotes[QUOTE_COLUMNS]
+
+
+def write_option_quotes(quotes, path):
+    quotes[QUOTE_COLUMNS].to_csv(path, index=False, date_format="%Y-%m-%d")
+
+
+def generate_option_quotes(future_price, valuation_date, r=0.04, nb_expiries=12,
+                           moneyness=(0.6, 0.7, 0.8, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2, 1.35, 1.5, 1.75, 2.0),
+                           atm_vol=0.8, skew=0.15, smile=0.5, term_slope=-0.15, seed=42):
+    """
+    Fausses cotations (calls et puts, une échéance par mois) avec un smile et une structure par terme,
+    pour remplacer un flux de marché tant qu'il n'y en a pas.
+    """
+
+    rng = np.random.default_rng(seed)
+    valuation_date = pd.Timestamp(valuation_date)
+    expiries = pd.date_range(valuation_date + pd.offsets.MonthBegin(1), periods=nb_expiries, freq="MS")
+
+    rows = []
+    for expiry in expiries:
+        T = (expiry - valuation_date).days / 365
+        forward = future_price * np.exp(rng.normal(0, 0.03))
+        strikes = forward * np.asarray(moneyness)
+        k = np.log(strikes / forward)
+        sigma = np.maximum(atm_vol * (1 + term_slope * np.log1p(T)) + skew * k + smile * k ** 2, 0.05)
+        for option_type in ["call", "put"]:
+            prices = b76.black76_price(forward, strikes, T, r, sigma, option_type)
+            for strike, price in zip(strikes, prices):
+                rows.append([valuation_date, expiry, strike, option_type, price, forward])
+
+    return pd.DataFrame(rows, columns=QUOTE_COLUMNS)
+
+
+# =========================
+# Nappe de volatilité implicite
+# =========================
+
+class VolSurface:
+    """
+    Nappe de vol implicite construite à partir d'une chaîne de cotations :
+    - toutes les vols implicites sont calculées en une fois (b76.implied_vol_black76), avec les options hors de la
+      monnaie quand un call et un put ont le même strike,
+    - pour chaque échéance, une spline cubique de la variance totale (sigma² T) en log-moneyness ln(K / F)
+      (coefficients calculés une fois, plate en dehors des strikes cotés),
+    - entre deux échéances, interpolation linéaire de la variance totale en T (vol constante avant la première et après
+      la dernière échéance), et du future.
+    Les vols de strikes / échéances hors grille ne demandent donc aucune nouvelle recherche de vol implicite.
+    """
+
+    def __init__(self, quotes, valuation_date, r=0.04):
+        self.valuation_date = pd.Timestamp(valuation_date)
+        self.r = r
+
+        # Des cotations d'une autre date donneraient des maturités et des futures faux
+        quote_dates = pd.to_datetime(quotes["quote_date"]).unique()
+        if len(quote_dates) != 1 or pd.Timestamp(quote_dates[0]) != self.valuation_date:
+            raise ValueError(f"Cotations du {', '.join(pd.Timestamp(d).strftime('%Y-%m-%d') for d in quote_dates)}, "
+                             f"date de valorisation du {self.valuation_date:%Y-%m-%d}")
+
+        quotes = quotes.copy()
+        quotes["T"] = (pd.to_datetime(quotes["expiry"]) - self.valuation_date).dt.days / 365
+        quotes = quotes[quotes["T"] > 0]
+
+        # Vols implicites de toute la chaîne
+        quotes["implied_vol"], quotes["iterations"] = b76.implied_vol_black76(
+            quotes["price"].to_numpy(), quotes["future_price"].to_numpy(), quotes["strike"].to_numpy(),
+            quotes["T"].to_numpy(), r, quotes["option_type"].to_numpy())
+        self.quotes = quotes
+
+        # Options hors de la monnaie (les plus liquides) : call au-dessus du future, put en dessous
+        otm = np.where(quotes["strike"] >= quotes["future_price"], "call", "put")
+        used = quotes[(quotes["option_type"] == otm) | ~quotes.duplicated(["expiry", "strike"], keep=False)]
+        used = used.dropna(subset=["implied_vol"])
+        if used.empty:
+            raise ValueError("Aucune vol implicite valide dans les cotations")
+
+        self.expiries = []
+        self.maturities = []
+        self.forwards = []
+        self.min_log_moneyness = []
+        self.max_log_moneyness = []
+        self.splines = []
+        for expiry, chain in used.groupby("expiry"):
+            forward = chain["future_price"].iloc[0]
+            T = chain["T"].iloc[0]
+            smile = (chain.assign(k=np.log(chain["strike"] / forward), w=chain["implied_vol"] ** 2 * T)
+                          .groupby("k")["w"].mean())
+
+            self.expiries.append(pd.Timestamp(expiry))
+            self.maturities.append(T)
+            self.forwards.append(forward)
+            self.min_log_moneyness.append(smile.index[0])
+            self.max_log_moneyness.append(smile.index[-1])
+            if len(smile) >= 2:
+                self.splines.append(CubicSpline(smile.index.to_numpy(), smile.to_numpy(), bc_type="natural"))
+            else:
+                # Un seul strike : variance totale constante
+                self.splines.append(lambda k, w=smile.iloc[0]: np.full(np.shape(k), w))
+
+        self.maturities = np.asarray(self.maturities)
+        self.forwards = np.asarray(self.forwards)
+        self.min_log_moneyness = np.asarray(self.min_log_moneyness)
+        self.max_log_moneyness = np.asarray(self.max_log_moneyness)
+
+    def forward(self, T):
+        """
+        Future interpolé linéairement entre les échéances (plat en dehors).
+        """
+        return np.interp(T, self.maturities, self.forwards)
+
+    def _slice_variance(self, j, k):
+        # Variance totale de l'échéance j (plate en dehors des strikes cotés)
+        return self.splines[j](np.clip(k, self.min_log_moneyness[j], self.max_log_moneyness[j]))
+
+    def total_variance(self, K, T, F=None):
+        """
+        Variance totale sigma² T pour des tableaux de strikes et de maturités (en années).
+        F : future de chaque option (par défaut celui de la nappe à la maturité T).
+        """
+
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        F = self.forward(T) if F is None else np.broadcast_to(np.asarray(F, dtype=float), K.shape)
+        k = np.log(K / F)
+
+        # Échéances qui encadrent chaque maturité
+        nb_expiries = len(self.maturities)
+        right = np.clip(np.searchsorted(self.maturities, T, side="left"), 0, nb_expiries - 1)
+        left = np.clip(right - 1, 0, nb_expiries - 1)
+
+        # Variances totales des deux échéances (chaque spline n'est évaluée que pour les options qui l'utilisent)
+        w_left = np.empty(K.shape)
+        w_right = np.empty(K.shape)
+        for j in np.unique(np.concatenate((left.ravel(), right.ravel()))):
+            on_left, on_right = left == j, right == j
+            w_left[on_left] = self._slice_variance(j, k[on_left])
+            w_right[on_right] = self._slice_variance(j, k[on_right])
+
+        # Interpolation linéaire de la variance totale en T, vol constante en dehors des échéances cotées
+        T_left, T_right = self.maturities[left], self.maturities[right]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(T_right > T_left, (T - T_left) / (T_right - T_left), 0.0)
+            inside = w_left + np.clip(weight, 0.0, 1.0) * (w_right - w_left)
+            outside = w_right / T_right * T
+        return np.where((T <= self.maturities[0]) | (T >= self.maturities[-1]), outside, inside)
+
+    def sigma(self, K, T, F=None):
+        """
+        Vol implicite pour des tableaux de strikes et de maturités (en années).
+        """
+        T = np.asarray(T, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(np.maximum(self.total_variance(K, T, F), 0.0) / T)
+
+    def price(self, K, T, option_type="call", F=None):
+        """
+        Prix Black-76 avec la vol de la nappe.
+        """
+        T = np.asarray(T, dtype=float)
+        F = self.forward(T) if F is None else F
+        return b76.black76_price(F, K, T, self.r, self.sigma(K, T, F), option_type)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import market_librairies_nat_gaz as market
+
+# =========================
+# Cotations et nappe de vol (toutes les vols implicites en une fois, splines calculées une fois)
+# =========================
+
+r = 0.04
+
+# Dernier prix du future M-1, date de valorisation et nappe (fichier local de cotations s'il existe, sinon fausses cotations)
+market_nat_gaz = market.load_market(r)
+valuation_date = market_nat_gaz["valuation_date"]
+future_price = market_nat_gaz["future_price"]
+surface = market_nat_gaz["surfaces"][market.UNDERLYING]
+
+print("Échéances :", [expiry.strftime("%Y-%m-%d") for expiry in surface.expiries])
+print("Itérations max de la vol implicite :", int(surface.quotes["iterations"].max()))
+
+# Vols sur une grille de strikes / maturités hors cotations (simple lecture de la nappe)
+strikes = future_price * np.array([0.75, 0.9, 1.0, 1.1, 1.3])
+maturities = np.array([15, 45, 100, 200, 330]) / 365
+grid = surface.sigma(strikes[None, :], maturities[:, None])
+
+print("\nVols de la nappe (lignes : maturités en jours, colonnes : strikes) :")
+print(pd.DataFrame(grid, index=(maturities * 365).round().astype(int), columns=strikes.round(3)))
+
+# Prix d'options hors grille
+print("\nCall strike", round(strikes[3], 3), "à 45 jours :", round(float(surface.price(strikes[3], 45 / 365, "call")), 6))
+print("Put strike", round(strikes[1], 3), "à 100 jours :", round(float(surface.price(strikes[1], 100 / 365, "put")), 6))
@@ -0,0 +1,144 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+
+class YahooFinanceSource:
+    """
+    Download the daily closing prices (Adj Close or Close) of one ticker from Yahoo Finance.
+    """
+
+    def fetch(self, ticker, start_date, end_date):
+        # Imported here so that the engine can be used offline without yfinance
+        import yfinance as yf
+
+        # yf.Ticker is used instead of yf.download because yf.download shares global state between threads
+        # raise_errors: network and ticker errors raise (by default history() returns an empty frame and
+        # download_ticker would never retry)
+        data = yf.Ticker(ticker).history(start=start_date, end=end_date, interval="1d", auto_adjust=False,
+                                         raise_errors=True)
+        if data.empty:
+            return pd.Series(dtype="float64", name=ticker)
+
+        # Normalize: keep Adj Close or Close (closing prices(prix de cloture des marchés))
+        column = "Adj Close" if "Adj Close" in data.columns else "Close"
+        prices = data[column].astype(float)
+
+        # Same index as yf.download: naive dates
+        if prices.index.tz is not None:
+            prices.index = prices.index.tz_localize(None)
+        prices.index = prices.index.normalize()
+
+        return prices.rename(ticker)
+
+
+def local_file_name(ticker):
+    """
+    Name of the CSV file of a ticker in a local source folder (GC=F -> GC_F.csv).
+    """
+    return re.sub(r"[^A-Za-z0-9]", "_", str(ticker)) + ".csv"
+
+
+class LocalFileSource:
+    """
+    Read the prices of one ticker from a CSV file (Date, price) in a folder: offline stand-in of Yahoo Finance.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def fetch(self, ticker, start_date, end_date):
+        path = os.path.join(self.folder, local_file_name(ticker))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No local file for {ticker}: {path}")
+
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        prices = data.iloc[:, 0].astype(float)
+
+        # Same convention as yf.download: start included, end excluded
+        prices = prices.loc[(prices.index >= pd.Timestamp(start_date)) & (prices.index < pd.Timestamp(end_date))]
+
+        return prices.rename(ticker)
+
+
+def write_local_files(data_download, folder):
+    """
+    Write each column of a DataFrame in a CSV file readable by LocalFileSource.
+    """
+
+    os.makedirs(folder, exist_ok=True)
+    for ticker in data_download.columns:
+        data_download[[ticker]].dropna().to_csv(os.path.join(folder, local_file_name(ticker)), index_label="Date")
+
+
+def download_ticker(source, ticker, start_date, end_date, retries=3, backoff=1.0):
+    """
+    Download one ticker, retry with an exponential backoff (backoff, 2*backoff, 4*backoff ... seconds) when the source fails.
+    """
+
+    for attempt in range(retries + 1):
+        try:
+            return source.fetch(ticker, start_date, end_date)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            print(f"⚠️ Download of {ticker} failed ({e}), retry {attempt + 1}/{retries}")
+            time.sleep(backoff * 2 ** attempt)
+
+
+def report_download(data_download):
+    """
+    Show the downloaded data and the % of missing values per column.
+    """
+
+    # Show data
+    print("✅ Data updated")
+    print("📊 Available columns:", list(data_download.columns))
+    print(data_download)
+
+    # Percentage of missing values per column
+    missing_pct = (data_download.isna().mean() * 100).round(2)
+    print("\n📉 % of missing values per column:")
+    print(missing_pct)
+
+    # Check if all values of missing_pct are NaN
+    if missing_pct.isnull().any() or (missing_pct == 100).all():
+        print("❌ Error during download (all data missing)")
+    else:
+        print("Download finished")
+
+
+def download_all_data(tickers, start_date, end_date, source=None, max_workers=8, retries=3, backoff=1.0, verbose=True):
+    """
+    Download the closing prices of a list of tickers in parallel (bounded thread pool) and align them on the same dates.
+    A ticker that still fails after the retries gives a column of NaN.
+    """
+
+    if source is None:
+        source = YahooFinanceSource()
+    tickers = list(tickers)
+
+    def fetch(ticker):
+        try:
+            return download_ticker(source, ticker, start_date, end_date, retries, backoff)
+        except Exception as e:
+            print(f"❌ Failed to download data for {ticker}: {e}")
+            return pd.Series(dtype="float64", name=ticker)
+
+    # The downloads wait on the network: threads are enough
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+        all_prices = list(executor.map(fetch, tickers))
+
+    # Align all the tickers on the union of the dates (same shape as yf.download)
+    data_download = pd.concat(all_prices, axis=1, join="outer").sort_index() if tickers else pd.DataFrame()
+    data_download = data_download.reindex(columns=tickers).astype(np.float64)
+    data_download.index = pd.DatetimeIndex(data_download.index, name="Date").astype("datetime64[ns]")
+    data_download.columns = pd.Index(tickers, dtype="object", name="Ticker")
+
+    if verbose:
+        report_download(data_download)
+
+    return data_download
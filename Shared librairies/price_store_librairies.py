@@ -0,0 +1,545 @@
+import json
+import os
+import re
+import threading
+import uuid
+import numpy as np
+import pandas as pd
+
+# Layout of a store directory:
+#   manifest.json : number of rows, dtypes and the file used by each ticker
+#   dates.bin     : the shared date index (datetime64[ns] as int64)
+#   <ticker>.bin  : one float64 column per ticker, same length as dates.bin
+MANIFEST_NAME = "manifest.json"
+DATES_NAME = "dates.bin"
+FORMAT_VERSION = 1
+DATE_DTYPE = "datetime64[ns]"
+VALUE_DTYPE = "float64"
+
+
+def ticker_file_name(ticker, used_names=()):
+    """
+    Build a file name for a ticker that is safe on every OS (GC=F -> GC_F.bin).
+    """
+
+    base = re.sub(r"[^A-Za-z0-9]", "_", str(ticker)) or "ticker"
+    name = f"{base}.bin"
+
+    # Avoid collisions (ex: '^GSPC' and '_GSPC' give the same base)
+    i = 1
+    while name in used_names or name == DATES_NAME:
+        name = f"{base}_{i}.bin"
+        i += 1
+
+    return name
+
+
+def _write_manifest(store_path, manifest):
+    """
+    Write the manifest atomically (the manifest is written last, after every data file it points to is complete).
+    """
+
+    tmp_path = os.path.join(store_path, MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(store_path, MANIFEST_NAME))
+
+
+def _replace_file(path, values):
+    """
+    Write an array into a temporary file and move it over path with os.replace. The old file is never truncated:
+    a process that already mapped it keeps reading the old content until it opens the store again.
+    """
+
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        values.tofile(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _append_to_file(path, values, length):
+    """
+    Write values after the first length items of a file. Bytes left after them by an interrupted append
+    (data written but manifest never updated) are dropped first, so the new rows stay aligned with the date index.
+    """
+
+    start = length * values.itemsize
+    with open(path, "r+b") as f:
+        if f.seek(0, os.SEEK_END) < start:
+            raise ValueError(f"{path} is shorter than the {length} rows of the manifest")
+        f.seek(start)
+        f.truncate()
+        f.write(np.ascontiguousarray(values).tobytes())
+
+
+def read_manifest(store_path):
+    """
+    Read the manifest of a store, raise FileNotFoundError if the store does not exist.
+    """
+
+    manifest_path = os.path.join(store_path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"❌ No price store found at {store_path}. Run the download script first.")
+
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported price store format ({manifest.get('format_version')})")
+
+    return manifest
+
+
+def write_price_store(data_download, store_path):
+    """
+    Write a DataFrame (dates x tickers) into a columnar store: one binary file per ticker plus a date index.
+    """
+
+    if not isinstance(data_download.index, pd.DatetimeIndex):
+        raise TypeError("The data must have a DatetimeIndex")
+
+    data_download = data_download.sort_index()
+    os.makedirs(store_path, exist_ok=True)
+
+    # Keep the revision counter growing when an existing store is overwritten
+    try:
+        revision = read_manifest(store_path)["revision"] + 1
+    except (FileNotFoundError, ValueError, KeyError):
+        revision = 1
+
+    # Date index
+    dates = data_download.index.values.astype(DATE_DTYPE).view("int64")
+    _replace_file(os.path.join(store_path, DATES_NAME), dates)
+
+    # One file per ticker
+    tickers = {}
+    for ticker in data_download.columns:
+        file_name = ticker_file_name(ticker, tickers.values())
+        values = np.ascontiguousarray(data_download[ticker].to_numpy(dtype=VALUE_DTYPE))
+        _replace_file(os.path.join(store_path, file_name), values)
+        tickers[str(ticker)] = file_name
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "length": int(len(data_download)),
+        "date_dtype": DATE_DTYPE,
+        "value_dtype": VALUE_DTYPE,
+        "index_name": data_download.index.name,
+        "columns_name": data_download.columns.name,
+        "tickers": tickers,
+        "revision": revision,
+        "fingerprint": uuid.uuid4().hex,
+    }
+    _write_manifest(store_path, manifest)
+    forget_dataset(store_path)
+
+    # Files of tickers that are no longer in the store
+    for file_name in os.listdir(store_path):
+        if file_name.endswith(".bin") and file_name != DATES_NAME and file_name not in tickers.values():
+            os.remove(os.path.join(store_path, file_name))
+
+    return manifest
+
+
+class PriceStore:
+    """
+    Read-only handle on a price store. Columns are memory-mapped only when they are used.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.manifest = read_manifest(store_path)
+        self.length = self.manifest["length"]
+        self._columns = {}
+        self._dates = None
+
+    @property
+    def tickers(self):
+        return list(self.manifest["tickers"])
+
+    @property
+    def fingerprint(self):
+        return self.manifest["fingerprint"]
+
+    def _map(self, file_name, dtype):
+        # np.memmap does not accept empty files
+        if self.length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.store_path, file_name), dtype=dtype, mode="r", shape=(self.length,))
+
+    @property
+    def dates(self):
+        """
+        Date index of the store as datetime64[ns] (memory-mapped).
+        """
+        if self._dates is None:
+            self._dates = self._map(DATES_NAME, "int64").view(DATE_DTYPE)
+        return self._dates
+
+    def column(self, ticker):
+        """
+        Memory-mapped values of one ticker.
+        """
+        if ticker not in self.manifest["tickers"]:
+            raise KeyError(f"Ticker {ticker} is missing from the price store.")
+        if ticker not in self._columns:
+            self._columns[ticker] = self._map(self.manifest["tickers"][ticker], self.manifest["value_dtype"])
+        return self._columns[ticker]
+
+    def row_range(self, start_date=None, end_date=None):
+        """
+        Positions [left, right) of the rows between start_date and end_date (both included, like .loc).
+        """
+        dates = self.dates
+        left = 0 if start_date is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date), "ns"), side="left"))
+        right = self.length if end_date is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date), "ns"), side="right"))
+        return left, max(left, right)
+
+    def read(self, tickers=None, start_date=None, end_date=None):
+        """
+        Build a DataFrame with only the requested tickers and dates (only these pages are read from disk).
+        """
+        if tickers is None:
+            tickers = self.tickers
+        left, right = self.row_range(start_date, end_date)
+
+        index = pd.DatetimeIndex(np.array(self.dates[left:right]), name=self.manifest["index_name"])
+        data = {ticker: np.array(self.column(ticker)[left:right]) for ticker in tickers}
+        columns = pd.Index(list(tickers), dtype="object", name=self.manifest["columns_name"])
+
+        return pd.DataFrame(data, index=index, columns=columns)
+
+
+def open_price_store(store_path):
+    """
+    Open a store without reading any column.
+    """
+    return PriceStore(store_path)
+
+
+def read_price_store(store_path, tickers=None, start_date=None, end_date=None):
+    """
+    Read the requested tickers and dates of a store into a DataFrame.
+    """
+    return open_price_store(store_path).read(tickers, start_date, end_date)
+
+
+# Datasets already loaded by the process (key = absolute path of the store) and the fingerprint of each one
+_DATASETS = {}
+_FINGERPRINTS = {}
+_DATASETS_LOCK = threading.Lock()
+
+
+def get_dataset(store_path, reload=False):
+    """
+    Return the full DataFrame of a store. It is loaded on the first call only and then shared by the whole process.
+    """
+
+    key = os.path.abspath(store_path)
+    data = _DATASETS.get(key)
+    if data is not None and not reload:
+        return data
+
+    # Only one thread loads the store, the others wait and reuse it
+    with _DATASETS_LOCK:
+        data = _DATASETS.get(key)
+        if data is None or reload:
+            store = open_price_store(key)
+            data = store.read()
+            _FINGERPRINTS[key] = store.fingerprint
+            _DATASETS[key] = data
+
+    return data
+
+
+def get_columns(store_path, tickers, start_date=None, end_date=None):
+    """
+    DataFrame of the requested tickers between start_date and end_date (both included). When the full dataset is
+    already in memory (get_dataset / set_dataset) it is sliced, otherwise only these columns and dates are read from the store.
+    """
+
+    data = _DATASETS.get(os.path.abspath(store_path))
+    if data is not None:
+        return data.loc[start_date:end_date, list(tickers)]
+    return read_price_store(store_path, list(tickers), start_date, end_date)
+
+
+def set_dataset(store_path, data):
+    """
+    Replace the dataset of a store in memory (ex: synthetic data), nothing is written on disk.
+    """
+    with _DATASETS_LOCK:
+        _FINGERPRINTS[os.path.abspath(store_path)] = uuid.uuid4().hex
+        _DATASETS[os.path.abspath(store_path)] = data
+
+
+def forget_dataset(store_path):
+    """
+    Drop the dataset of a store from memory, it will be loaded again on the next call of get_dataset.
+    """
+    with _DATASETS_LOCK:
+        _DATASETS.pop(os.path.abspath(store_path), None)
+        _FINGERPRINTS.pop(os.path.abspath(store_path), None)
+        _COMPACT_DATASETS.pop(os.path.abspath(store_path), None)
+
+
+def get_dataset_fingerprint(store_path):
+    """
+    Fingerprint of the dataset in memory (changes each time the store is written, refreshed or replaced in memory).
+    Results computed from the dataset can be cached with this key. The dataset itself is not loaded.
+    """
+
+    key = os.path.abspath(store_path)
+    fingerprint = _FINGERPRINTS.get(key)
+    if fingerprint is not None:
+        return fingerprint
+
+    with _DATASETS_LOCK:
+        if key not in _FINGERPRINTS:
+            _FINGERPRINTS[key] = read_manifest(key)["fingerprint"]
+        return _FINGERPRINTS[key]
+
+
+class CompactPrices:
+    """
+    Compact representation of a dataset for large multi-asset histories:
+    - one int32 day index shared by all the tickers (days since the first date),
+    - each ticker only keeps its rows between its first and its last value, as float32,
+    - a validity mask per ticker replaces the NaN padding.
+    """
+
+    def __init__(self, dates, columns):
+        dates = pd.DatetimeIndex(dates)
+        self.start = dates[0].normalize() if len(dates) else pd.Timestamp(0)
+        self.days = np.asarray((dates.normalize() - self.start).days, dtype=np.int32)
+        self.tickers = []
+        self.first_row = {}
+        self.values = {}
+        self.valid = {}
+
+        for ticker, column in columns:
+            valid = ~np.isnan(column)
+            rows = np.flatnonzero(valid)
+            first, last = (rows[0], rows[-1] + 1) if len(rows) else (0, 0)
+            self.tickers.append(ticker)
+            self.first_row[ticker] = int(first)
+            self.values[ticker] = np.asarray(column[first:last], dtype=np.float32)
+            self.valid[ticker] = np.array(valid[first:last])
+
+    @classmethod
+    def from_frame(cls, data):
+        return cls(data.index, ((ticker, data[ticker].to_numpy(dtype=np.float64)) for ticker in data.columns))
+
+    @classmethod
+    def from_store(cls, store):
+        # The columns are read one after the other: the float64 dataset is never in memory at once
+        return cls(np.array(store.dates), ((ticker, store.column(ticker)) for ticker in store.tickers))
+
+    @property
+    def nbytes(self):
+        return self.days.nbytes + sum(self.values[t].nbytes + self.valid[t].nbytes for t in self.tickers)
+
+    def dates(self, rows=None):
+        """
+        Dates of the rows (all the dates by default).
+        """
+        days = self.days if rows is None else self.days[rows]
+        return self.start + pd.to_timedelta(days.astype(np.int64), unit="D")
+
+    def complete(self, tickers, start_date=None, end_date=None):
+        """
+        Rows where all the tickers have a value (between start_date and end_date, both included)
+        and their values (rows x tickers, float32).
+        """
+
+        for ticker in tickers:
+            if ticker not in self.values:
+                raise KeyError(f"Ticker {ticker} is missing from the price store.")
+
+        # Common range of the tickers, then the rows valid for all of them
+        first = max([self.first_row[t] for t in tickers] + [0])
+        last = min([self.first_row[t] + len(self.values[t]) for t in tickers] + [len(self.days)])
+        if start_date is not None:
+            first = max(first, int(np.searchsorted(self.days, (pd.Timestamp(start_date) - self.start).days, side="left")))
+        if end_date is not None:
+            last = min(last, int(np.searchsorted(self.days, (pd.Timestamp(end_date) - self.start).days, side="right")))
+        if first >= last:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, len(tickers)), dtype=np.float32)
+
+        valid = np.ones(last - first, dtype=bool)
+        for ticker in tickers:
+            offset = first - self.first_row[ticker]
+            valid &= self.valid[ticker][offset:offset + last - first]
+        rows = np.flatnonzero(valid) + first
+
+        values = np.empty((len(rows), len(tickers)), dtype=np.float32)
+        for j, ticker in enumerate(tickers):
+            values[:, j] = self.values[ticker][rows - self.first_row[ticker]]
+
+        return rows, values
+
+    def complete_frame(self, tickers, start_date=None, end_date=None):
+        """
+        Same as data[tickers].loc[start_date:end_date].dropna(), with float32 values.
+        """
+        rows, values = self.complete(tickers, start_date, end_date)
+        index = pd.DatetimeIndex(self.dates(rows), name="Date")
+        return pd.DataFrame(values, index=index, columns=pd.Index(list(tickers), name="Ticker"))
+
+
+# Compact datasets already built (key = absolute path of the store): (fingerprint, CompactPrices)
+_COMPACT_DATASETS = {}
+
+
+def get_compact_dataset(store_path):
+    """
+    Compact version of the dataset of a store, built once per fingerprint. When a dataset was put in memory
+    (set_dataset or get_dataset) it is converted, otherwise the columns are read from the store one by one.
+    """
+
+    key = os.path.abspath(store_path)
+    fingerprint = get_dataset_fingerprint(key)
+    cached = _COMPACT_DATASETS.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    data = _DATASETS.get(key)
+    compact = CompactPrices.from_frame(data) if data is not None else CompactPrices.from_store(open_price_store(key))
+    _COMPACT_DATASETS[key] = (fingerprint, compact)
+
+    return compact
+
+
+def last_valid_dates(store_path):
+    """
+    Last date with a value for each ticker of the store (None when the ticker has no value).
+    """
+
+    store = open_price_store(store_path)
+    dates = store.dates
+    last_dates = {}
+    for ticker in store.tickers:
+        valid = np.flatnonzero(~np.isnan(store.column(ticker)))
+        last_dates[ticker] = pd.Timestamp(dates[valid[-1]]) if len(valid) else None
+
+    return last_dates
+
+
+def append_price_store(new_data, store_path):
+    """
+    Merge new rows into an existing store, only the files that changed are written:
+    - values on dates already stored are written in place,
+    - new dates are appended at the end of the date index and of every column (NaN when a ticker has no value),
+    - a new ticker gets a new file.
+    Return the number of new dates.
+    """
+
+    if not os.path.exists(os.path.join(store_path, MANIFEST_NAME)):
+        write_price_store(new_data, store_path)
+        return len(new_data)
+
+    new_data = new_data.sort_index()
+    new_data = new_data.dropna(how="all")
+    if new_data.empty:
+        return 0
+
+    store = open_price_store(store_path)
+    manifest = store.manifest
+    length = store.length
+    dates = np.array(store.dates)
+    new_dates = new_data.index.values.astype(DATE_DTYPE)
+
+    # Split the new rows between dates already in the store and dates after the end of the store
+    last_date = dates[-1] if length else None
+    is_tail = np.ones(len(new_dates), dtype=bool) if last_date is None else new_dates > last_date
+    overlap_dates = new_dates[~is_tail]
+    overlap_rows = np.searchsorted(dates, overlap_dates)
+
+    # A date inside the stored history that is not in the index cannot be appended: rewrite the store
+    if len(overlap_dates) and not np.array_equal(dates[overlap_rows], overlap_dates):
+        merged = new_data.combine_first(store.read())
+        write_price_store(merged, store_path)
+        return int(is_tail.sum())
+
+    tail = new_data.loc[is_tail]
+    n_tail = len(tail)
+
+    # Tickers never stored before get a column of NaN with the length of the store
+    tickers = manifest["tickers"]
+    for ticker in new_data.columns:
+        if str(ticker) not in tickers:
+            file_name = ticker_file_name(ticker, tickers.values())
+            np.full(length, np.nan, dtype=VALUE_DTYPE).tofile(os.path.join(store_path, file_name))
+            tickers[str(ticker)] = file_name
+
+    # Values on dates already stored: write in place, only where the new data has a value
+    if len(overlap_dates):
+        overlap = new_data.loc[~is_tail]
+        for ticker in overlap.columns:
+            values = overlap[ticker].to_numpy(dtype=VALUE_DTYPE)
+            has_value = ~np.isnan(values)
+            if not has_value.any():
+                continue
+            column = np.memmap(os.path.join(store_path, tickers[str(ticker)]), dtype=VALUE_DTYPE, mode="r+", shape=(length,))
+            column[overlap_rows[has_value]] = values[has_value]
+            column.flush()
+            del column
+
+    # New dates: written after the rows of the manifest in each file
+    if n_tail:
+        _append_to_file(os.path.join(store_path, DATES_NAME), tail.index.values.astype(DATE_DTYPE).view("int64"), length)
+        for ticker, file_name in tickers.items():
+            if ticker in tail.columns:
+                values = tail[ticker].to_numpy(dtype=VALUE_DTYPE)
+            else:
+                values = np.full(n_tail, np.nan, dtype=VALUE_DTYPE)
+            _append_to_file(os.path.join(store_path, file_name), values, length)
+
+    # The manifest is updated last: readers keep the old length until the end of the merge
+    manifest["length"] = length + n_tail
+    manifest["tickers"] = tickers
+    manifest["revision"] = manifest.get("revision", 0) + 1
+    manifest["fingerprint"] = uuid.uuid4().hex
+    _write_manifest(store_path, manifest)
+    forget_dataset(store_path)
+
+    return n_tail
+
+
+def refresh_price_store(store_path, download_function, end_date, start_date="1970-01-01"):
+    """
+    Fetch only the missing tail of each ticker and merge it into the store.
+    download_function(start_date, end_date) returns a DataFrame (dates x tickers), end_date excluded like yf.download.
+    """
+
+    # Nothing stored yet: full download
+    if not os.path.exists(os.path.join(store_path, MANIFEST_NAME)):
+        data_download = download_function(start_date, end_date)
+        if data_download.empty:
+            return 0
+        write_price_store(data_download, store_path)
+        return len(data_download)
+
+    # Download from the day after the oldest last stored date
+    last_dates = last_valid_dates(store_path)
+    known_dates = [date for date in last_dates.values() if date is not None]
+    fetch_start = min(known_dates) + pd.Timedelta(days=1) if len(known_dates) == len(last_dates) and known_dates else pd.Timestamp(start_date)
+    if fetch_start >= pd.Timestamp(end_date):
+        return 0
+
+    tail = download_function(fetch_start.strftime("%Y-%m-%d"), end_date)
+    if tail is None or tail.empty:
+        return 0
+
+    # Keep for each ticker only the values after its own last stored date
+    tail = tail.copy()
+    for ticker in tail.columns:
+        last_date = last_dates.get(str(ticker))
+        if last_date is not None:
+            tail.loc[tail.index <= last_date, ticker] = np.nan
+
+    return append_price_store(tail, store_path)
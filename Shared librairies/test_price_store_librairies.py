@@ -0,0 +1,90 @@
+import os
+import numpy as np
+import pandas as pd
+import price_store_librairies as price_store
+
+
+class LocalSource:
+    """
+    Stand-in for the download engine: serves a fixed DataFrame like download_all_data(start_date, end_date)
+    (end_date excluded) and records the requested ranges.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+
+    def __call__(self, start_date, end_date):
+        self.calls.append((pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        rows = (self.data.index >= pd.Timestamp(start_date)) & (self.data.index < pd.Timestamp(end_date))
+        return self.data.loc[rows]
+
+
+def make_history(nb_days=30):
+    dates = pd.date_range("2020-01-01", periods=nb_days, freq="D", name="Date").as_unit("ns")
+    return pd.DataFrame({"GC=F": np.arange(nb_days, dtype=float) + 100,
+                         "^GSPC": np.arange(nb_days, dtype=float) + 3000},
+                        index=dates, columns=pd.Index(["GC=F", "^GSPC"], dtype="object", name="Ticker"))
+
+
+def test_refresh_fetches_only_the_missing_tail(tmp_path):
+    store_path = str(tmp_path / "store")
+    history = make_history()
+    source = LocalSource(history)
+
+    assert price_store.refresh_price_store(store_path, source, "2020-01-21", start_date="2020-01-01") == 20
+    assert price_store.refresh_price_store(store_path, source, "2020-01-31", start_date="2020-01-01") == 10
+
+    # Second call starts the day after the last stored date
+    assert source.calls[-1] == (pd.Timestamp("2020-01-21"), pd.Timestamp("2020-01-31"))
+    pd.testing.assert_frame_equal(price_store.read_price_store(store_path), history, check_freq=False)
+
+    # Up to date: nothing is fetched
+    assert price_store.refresh_price_store(store_path, source, "2020-01-31", start_date="2020-01-01") == 0
+    assert len(source.calls) == 2
+
+
+def test_refresh_only_fills_tickers_behind(tmp_path):
+    store_path = str(tmp_path / "store")
+    history = make_history()
+    stored = history.iloc[:20].copy()
+    stored.iloc[15:, 1] = np.nan
+    price_store.write_price_store(stored, store_path)
+
+    price_store.refresh_price_store(store_path, LocalSource(history), "2020-01-31")
+
+    pd.testing.assert_frame_equal(price_store.read_price_store(store_path), history, check_freq=False)
+
+
+def test_append_after_an_interrupted_append(tmp_path):
+    store_path = str(tmp_path / "store")
+    history = make_history(12)
+    price_store.write_price_store(history.iloc[:10], store_path)
+
+    # Append interrupted after the data files were written but before the manifest
+    manifest = price_store.read_manifest(store_path)
+    for file_name in [price_store.DATES_NAME] + list(manifest["tickers"].values()):
+        with open(os.path.join(store_path, file_name), "ab") as f:
+            f.write(np.arange(3, dtype="int64").tobytes())
+
+    price_store.append_price_store(history.iloc[10:], store_path)
+
+    stored = price_store.read_price_store(store_path)
+    assert stored.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(stored, history, check_freq=False)
+    assert os.path.getsize(os.path.join(store_path, price_store.DATES_NAME)) == 12 * 8
+
+
+def test_append_overwrites_existing_dates_and_adds_tickers(tmp_path):
+    store_path = str(tmp_path / "store")
+    history = make_history(10)
+    price_store.write_price_store(history, store_path)
+
+    update = pd.DataFrame({"GC=F": [1.0], "IEF": [2.0]}, index=pd.DatetimeIndex(["2020-01-05"], name="Date"))
+    assert price_store.append_price_store(update, store_path) == 0
+
+    stored = price_store.read_price_store(store_path)
+    assert stored.loc["2020-01-05", "GC=F"] == 1.0
+    assert stored.loc["2020-01-05", "IEF"] == 2.0
+    assert stored["IEF"].isna().sum() == 9
+    assert stored["^GSPC"].equals(history["^GSPC"])